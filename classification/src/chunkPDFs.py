@@ -4,6 +4,11 @@ methods. The config file describes the layout of the PDF for chunking and extrac
 
 For 'visualizePDF' method matplotlib version 3.8.3 is required.
 
+'chunkPageAsText' reads the page text with pypdfium2 when it is installed and falls back to the PDF elements otherwise.
+
+Each PDF is loaded once per call of a public method (nested calls share it) and released when that call returns.
+Batch drivers can call 'clearPdfCache' between files to also drop the cached config files.
+
 Chunking and extraction methods rely on the PDF elements as decsibred by py_pdf_parser library. The
 arrays will always contain the index of the element in the PDF. You will need to use the index to get
 the actual element using 'getElementsUsingIndex' method.
@@ -15,12 +20,22 @@ getText: Returns the text of all elements of the PDF within the given start & en
 getTable: Returns the entire section of the PDF within the start & end elements as a table
 getSentences: Returns each row of horizontally aligned elements (table row) as a sentence within the given 
     start & end elements
+getTextFromElements, getTableFromElements & getSentencesFromElements: Same as above for an already filtered
+    list of elements (e.g. a page), without reopening the PDF
 '''
 
 # Import modules
-import json
 import datetime
+import gc
 import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+from operator import attrgetter
+from typing import Any
+from pathlib import Path
+from weakref import WeakKeyDictionary
+import orjson
 import py_pdf_parser
 try:
     from py_pdf_parser.visualise import visualise
@@ -28,12 +43,210 @@ try:
 except ImportError:
     VISUALISE_AVAILABLE = False
     visualise = None
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+    pdfium = None
 from py_pdf_parser.loaders import load_file
 from py_pdf_parser import tables
+from py_pdf_parser.exceptions import PageNotFoundError
+from pdfminer.psparser import PSException
 from pypdf import PdfReader
 from src import helperFunctions
+from src.logs import intializeLogs
+
+logger = intializeLogs()
+
+# Errors raised by 'load_file' for a missing, unreadable or malformed PDF (pdfminer errors derive from PSException)
+_PDF_OPEN_ERRORS = (OSError, PSException)
+
+# Sort key for document section rows, shared by the chunk-info builders
+_sectionStart = attrgetter('startIndex')
+
+
+@dataclass(slots=True)
+class Section:
+    '''
+        One row of the document sections table built by 'getChunksInfo' and 'getChunkInfoByWords'.
+    ATTRIBUTES
+        code (string): Code of the chunk (See JSON) or the word it was found by.
+        found (bool): True if the chunk is present.
+        startIndex (int): Start index of the chunk, -1 if missing.
+        endIndex (int): End index of the chunk.
+        startElement (element): Start element of the chunk.
+        endElement (element): End element of the chunk.
+        errorMessage (string): Error message, if any (related to entire chunk).
+        fileName (string): PDF file name.
+        name (string): Chunk name.
+        startPage (int): Start page.
+        endPage (int): End page.
+    '''
+    code: str
+    found: bool
+    startIndex: int
+    endIndex: int
+    startElement: Any
+    endElement: Any
+    errorMessage: str
+    fileName: str
+    name: str
+    startPage: int
+    endPage: int
+
+
+@lru_cache(maxsize=64)
+def _loadConfig(cfgFile, mtime):
+    '''
+        Parse a chunking config file. Cached by path and modification time so repeat calls skip the file read.
+    ARGS
+        cfgFile (string, path): Path to Config file (json).
+        mtime (float): Modification time of the config file, part of the cache key.
+    RETURN
+        data (dictionary): Parsed config. Treat as read-only, the same object is shared across calls.
+    '''
+    return orjson.loads(Path(cfgFile).read_bytes())
+
+# Element indexes of each loaded PDF in order, with the position of every element index in that list.
+# Only plain ints are cached: elements point back to their document and would keep the weak key alive.
+_elemIndexCache = WeakKeyDictionary()
+
+def _elementIndex(pdfDoc):
+    '''
+        Get the element indexes of the PDF in order and a lookup of element index to list position. Built once per document.
+    ARGS
+        pdfDoc (PDFDocument): Loaded PDF.
+    RETURN
+        (indexList, positions) (tuple): List of element indexes and dictionary of element index -> position in the list.
+    '''
+    cached = _elemIndexCache.get(pdfDoc)
+    if cached is None:
+        indexList = [e._index for e in pdfDoc.elements]
+        cached = (indexList, {index: i for i, index in enumerate(indexList)})
+        _elemIndexCache[pdfDoc] = cached
+    return cached
+
+def _between(pdfDoc, start, end):
+    '''
+        Get all elements of the PDF between two given elements (inclusive), same as 'pdfDoc.elements.between'.
+    ARGS
+        pdfDoc (PDFDocument): Loaded PDF.
+        start (element): Starting element.
+        end (element): Ending element.
+    RETURN
+        elements (ElementList): Elements between start and end.
+    '''
+    indexList, positions = _elementIndex(pdfDoc)
+    block = indexList[positions[start._index]:positions[end._index] + 1]
+    return py_pdf_parser.filtering.ElementList(pdfDoc, frozenset(block))
+
+# Text and case-folded text of the elements of each loaded PDF, in the order of '_elementIndex' (strings only)
+_foldedCache = WeakKeyDictionary()
+
+def _foldedText(pdfDoc):
+    '''
+        Get the text and the case-folded text of all elements of the PDF. Built once per document.
+    ARGS
+        pdfDoc (PDFDocument): Loaded PDF.
+    RETURN
+        (texts, foldedTexts) (tuple): Lists aligned with the index list of '_elementIndex'.
+    '''
+    cached = _foldedCache.get(pdfDoc)
+    if cached is None:
+        texts = [e.text() for e in pdfDoc.elements]
+        cached = (texts, [t.casefold() for t in texts])
+        _foldedCache[pdfDoc] = cached
+    return cached
+
+def _filterByText(pdfDoc, elements, txtString):
+    '''
+        Get the elements whose text contains the given text (matching case), same as 'elements.filter_by_text_contains'.
+        The cached case-folded text narrows down the candidates so the element text is not rebuilt for every search.
+        Only the given elements are visited, so searching a block costs the size of the block, not of the document.
+    ARGS
+        pdfDoc (PDFDocument): Loaded PDF the elements belong to.
+        elements (ElementList): Elements to search.
+        txtString (string): Text to locate.
+    RETURN
+        matches (ElementList): Matching elements.
+    '''
+    positions = _elementIndex(pdfDoc)[1]
+    texts, foldedTexts = _foldedText(pdfDoc)
+    needle = txtString.casefold()
+
+    matches = []
+    for index in elements.indexes:
+        # Indexes outside of the document elements (e.g. ignored elements) never match, as before
+        i = positions.get(index)
+        if i is not None and needle in foldedTexts[i] and txtString in texts[i]:
+            matches.append(index)
+
+    return py_pdf_parser.filtering.ElementList(pdfDoc, frozenset(matches))
+
+# PDFs loaded during the current outermost public call, per thread. None outside of a call.
+_pdfScope = threading.local()
+
+def _loadPdf(pdfFile):
+    '''
+        Load a PDF. Within a public method the document is loaded once and shared by all nested calls.
+    ARGS
+        pdfFile (string, path): Path to PDF File.
+    RETURN
+        pdfDoc (PDFDocument): Loaded PDF. Raises the same errors as 'load_file'.
+    '''
+    documents = getattr(_pdfScope, 'documents', None)
+    if documents is None:
+        return load_file(pdfFile)
 
+    pdfDoc = documents.get(pdfFile)
+    if pdfDoc is None:
+        pdfDoc = load_file(pdfFile)
+        documents[pdfFile] = pdfDoc
+    return pdfDoc
+
+def _releasesPdf(func):
+    '''
+        Decorator for the public methods. PDFs loaded during the outermost call are released when it returns.
+    '''
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        # Nested call, the outermost call releases the documents
+        if getattr(_pdfScope, 'documents', None) is not None:
+            return func(*args, **kwargs)
+
+        _pdfScope.documents = {}
+        try:
+            return func(*args, **kwargs)
+        finally:
+            documents = _pdfScope.documents
+            _pdfScope.documents = None
+            if documents:
+                # Drop the per document data right away instead of waiting for the weak keys to die
+                for pdfDoc in documents.values():
+                    _elemIndexCache.pop(pdfDoc, None)
+                    _foldedCache.pop(pdfDoc, None)
+                del pdfDoc
+                documents.clear()
+                # py_pdf_parser elements point back to their document, so a parsed PDF is only freed by the
+                # cycle collector; only run it when this call actually loaded something
+                gc.collect()
+    return wrapper
+
+def clearPdfCache():
+    '''
+        Drop all cached config files and per document data, and collect released PDFs. Meant for batch drivers.
+    ARGS
+        None
+    RETURN
+        None
+    '''
+    _loadConfig.cache_clear()
+    _elemIndexCache.clear()
+    _foldedCache.clear()
+    gc.collect()
 
+@_releasesPdf
 def getElementsUsingIndex(pdfFile, start, end):
     '''
         Get all elements between given start and end indicies. This method is used by other methods of this service.
@@ -49,7 +262,7 @@ def getElementsUsingIndex(pdfFile, start, end):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
+        pdfDoc = _loadPdf(pdfFile)
     except Exception:
         return helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, '')
 
@@ -72,6 +285,18 @@ def getElementsUsingIndex(pdfFile, start, end):
 
     return (helperFunctions.getReturnArray(True, "", data))
 
+def getTextFromElements(elements):
+    '''
+        Get text of the given elements.
+    ARGS
+        elements (ElementList): PDF elements to read, e.g. a page from 'filter_by_page'.
+    RETURN
+        chunkText (string): Extracted text of the elements, stripped of leading and trailing whitespace.
+    '''
+    # Collect all text from the elements
+    return (' '.join([e.text() for e in elements]).strip())
+
+@_releasesPdf
 def getText(pdfFile, start, end):
     '''
         Get text between two given elements.
@@ -80,37 +305,29 @@ def getText(pdfFile, start, end):
         start (element): Starting element.
         end (element): Ending element.
     RETURN
-        chunkText (string): Extracted text from the pdf between given indices.
+        chunkText (string): Extracted text from the pdf between given indices, stripped of leading and trailing whitespace.
     '''
-    pdfDoc = load_file(pdfFile)
+    pdfDoc = _loadPdf(pdfFile)
     # Get elements between the given range
-    chunkBlock = pdfDoc.elements.between(start, end)
-    # Collect all text from the page
-    chunkText = ''
-    for e in chunkBlock:
-        chunkText = chunkText + e.text() + ' '
-    return (chunkText)
+    chunkBlock = _between(pdfDoc, start, end)
+    return (getTextFromElements(chunkBlock))
 
-def getTable (pdfFile, start, end):
+def getTableFromElements(elements):
     '''
-        Extract table within given elements.
+        Extract the given elements as a table.
     ARGS
-        pdfFile (string, path): Path to PDF File.
-        start (element): Starting element.
-        end (element): Ending element.
+        elements (ElementList): PDF elements to read, e.g. a page from 'filter_by_page'.
     RETURN
         tabRows (list): Extracted table as a list.
     '''
-    pdfDoc = load_file(pdfFile)
-
     # Start with low tolerance and go up to 50 points with 5 point increments
     tol = 0
     tabElements = []
 
-    # Get text of the page as table. Each row will be considered as one sentence
+    # Get text of the elements as table. Each row will be considered as one sentence
     while (tol < 50):
         try:
-            tabElements = tables.extract_table(pdfDoc.elements.between(start, end), as_text=True, tolerance=tol, fix_element_in_multiple_rows=True, fix_element_in_multiple_cols=True)
+            tabElements = tables.extract_table(elements, as_text=True, tolerance=tol, fix_element_in_multiple_rows=True, fix_element_in_multiple_cols=True)
             break
         except Exception:
             tol = tol + 5
@@ -122,6 +339,33 @@ def getTable (pdfFile, start, end):
 
     return tabRows
 
+@_releasesPdf
+def getTable (pdfFile, start, end):
+    '''
+        Extract table within given elements.
+    ARGS
+        pdfFile (string, path): Path to PDF File.
+        start (element): Starting element.
+        end (element): Ending element.
+    RETURN
+        tabRows (list): Extracted table as a list.
+    '''
+    pdfDoc = _loadPdf(pdfFile)
+    return getTableFromElements(_between(pdfDoc, start, end))
+
+def getSentencesFromElements(elements):
+    '''
+        Get text of the given elements as sentences.
+    ARGS
+        elements (ElementList): PDF elements to read, e.g. a page from 'filter_by_page'.
+    RETURN
+        sentences (list): Extracted text as sentences.
+    '''
+    # Get text of the elements as table. Each row will be considered as one sentence
+    tabElements = getTableFromElements(elements)
+    return (_rowsToSentences(tabElements))
+
+@_releasesPdf
 def getSentences(pdfFile, start, end):
     '''
         Get text between two given elements as sentences.
@@ -134,7 +378,16 @@ def getSentences(pdfFile, start, end):
     '''
     # Get text of the page as table. Each row will be considered as one sentence
     tabElements = getTable(pdfFile, start, end)
+    return (_rowsToSentences(tabElements))
 
+def _rowsToSentences(tabElements):
+    '''
+        Join the non-empty cells of each table row into a sentence.
+    ARGS
+        tabElements (list): Table rows as returned by 'getTable'.
+    RETURN
+        sentences (list): One sentence per row.
+    '''
     sentences = []
     # Split each row as one sentence
     for t in tabElements:
@@ -148,6 +401,13 @@ def getSentences(pdfFile, start, end):
 
     return (sentences)
 
+# Element-level extractors used by the chunkBetweenIndexAs* and chunkPageAs* methods
+_EXTRACTORS = {
+    'text': getTextFromElements,
+    'sentences': getSentencesFromElements,
+    'table': getTableFromElements
+}
+
 #############################################################################
 '''
     The following methods do not require a supporting config file:
@@ -163,6 +423,7 @@ def getSentences(pdfFile, start, end):
 '''
 #############################################################################
 
+@_releasesPdf
 def visualizePDF(pdfFile):
     '''
         Visualize the PDF to analyze its contents
@@ -172,14 +433,15 @@ def visualizePDF(pdfFile):
         None; loads visual of document within the function.
     '''
     if not VISUALISE_AVAILABLE:
-        print("Visualisation not available - ImageMagick not installed")
+        logger.warning("Visualisation not available - ImageMagick not installed")
         return
     
-    document = load_file(pdfFile)
+    document = _loadPdf(pdfFile)
     visualise(document)
 
     return
 
+@_releasesPdf
 def chunkAsText(pdfFile):
     '''
         Chunk the PDF as text
@@ -193,8 +455,8 @@ def chunkAsText(pdfFile):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     if (len(pdfDoc.page_numbers) == 0):
@@ -203,19 +465,20 @@ def chunkAsText(pdfFile):
     # Get the entire PDF as a block of text
     try:
         textBlock = getText(pdfFile, pdfDoc.elements[0], pdfDoc.elements[len(pdfDoc.elements)-1])
-    except:
+    except _PDF_OPEN_ERRORS + (IndexError,):
         return(helperFunctions.getReturnArray(False, "Error reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
 
     data = {
         "fileName": pdfFile,
         "dateCreated": datetime.datetime.now().strftime("%Y-%m-%d"),
-        "chunkSize": len(textBlock.strip()),
-        "chunks": textBlock.strip()
+        "chunkSize": len(textBlock),
+        "chunks": textBlock
     }
 
     return (helperFunctions.getReturnArray(True, "", data))
 
 # Get the entire PDF as an array of sentences
+@_releasesPdf
 def chunkAsSentences(pdfFile):
     '''
         Chunk the PDF as sentences.
@@ -229,8 +492,8 @@ def chunkAsSentences(pdfFile):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     if (len(pdfDoc.page_numbers) == 0):
@@ -239,7 +502,7 @@ def chunkAsSentences(pdfFile):
     # Get the entire PDF as a block of sentences
     try:
         strSentence = getSentences(pdfFile, pdfDoc.elements[0], pdfDoc.elements[len(pdfDoc.elements)-1])
-    except:
+    except _PDF_OPEN_ERRORS + (IndexError,):
         return(helperFunctions.getReturnArray(False, "Error reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
 
     if (len(strSentence) < 1):
@@ -255,6 +518,7 @@ def chunkAsSentences(pdfFile):
     return (helperFunctions.getReturnArray(True, "", data))
 
 # Chunk the entire PDF as a table
+@_releasesPdf
 def chunkAsTable(pdfFile):
     '''
         Chunk the PDF as table.
@@ -268,8 +532,8 @@ def chunkAsTable(pdfFile):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     if (len(pdfDoc.page_numbers) == 0):
@@ -278,7 +542,7 @@ def chunkAsTable(pdfFile):
     # Get table
     try:
         tabRows = getTable(pdfFile, pdfDoc.elements[0], pdfDoc.elements[len(pdfDoc.elements)-1])
-    except:
+    except _PDF_OPEN_ERRORS + (IndexError,):
         return(helperFunctions.getReturnArray(False, "Error reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
 
     if (len(tabRows) < 1):
@@ -293,6 +557,7 @@ def chunkAsTable(pdfFile):
 
     return (helperFunctions.getReturnArray(True, "", data))
 
+@_releasesPdf
 def findText (pdfFile, txtString):
     '''
         Find a string / text
@@ -307,27 +572,27 @@ def findText (pdfFile, txtString):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     if (len(pdfDoc.page_numbers) == 0):
         return(helperFunctions.getReturnArray(False, "Error in reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
 
     # Check for text as is (matching case)
-    tmpElement = pdfDoc.elements.filter_by_text_contains(txtString)
+    tmpElement = _filterByText(pdfDoc, pdfDoc.elements, txtString)
 
     # Check for text in upper case
     if (len(tmpElement) < 1):
-        tmpElement = pdfDoc.elements.filter_by_text_contains(txtString.upper())
+        tmpElement = _filterByText(pdfDoc, pdfDoc.elements, txtString.upper())
 
     # check with lower case
     if (len(tmpElement) < 1):
-        tmpElement = pdfDoc.elements.filter_by_text_contains(txtString.lower())
+        tmpElement = _filterByText(pdfDoc, pdfDoc.elements, txtString.lower())
             
     # Check with title case
     if (len(tmpElement) < 1):
-        tmpElement = pdfDoc.elements.filter_by_text_contains(txtString.title())
+        tmpElement = _filterByText(pdfDoc, pdfDoc.elements, txtString.title())
 
     data = {
         "pdfFile": pdfFile,
@@ -350,6 +615,7 @@ def findText (pdfFile, txtString):
     return (helperFunctions.getReturnArray(len(tmpElement) > 0, errMsg, data))
 
 # TODO: Try/except or if/else for edge cases within this function (EC = Edge Case in in line comments below)
+@_releasesPdf
 def findTextWithinBlock (pdfFile, txtString, start, end):
     '''
         Locate text within a pdf.
@@ -365,8 +631,8 @@ def findTextWithinBlock (pdfFile, txtString, start, end):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     if (len(pdfDoc.page_numbers) == 0):
@@ -380,25 +646,25 @@ def findTextWithinBlock (pdfFile, txtString, start, end):
         return(helperFunctions.getReturnArray(False, eBlock["message"], ''))
 
     # Open the PDF file
-    pdfDoc = load_file(pdfFile) # TODO EC
+    pdfDoc = _loadPdf(pdfFile) # TODO EC
 
     # Get the chunk between the two elements # TODO EC
-    chunkBlock = pdfDoc.elements.between(eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
+    chunkBlock = _between(pdfDoc, eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
 
     # Check for text as is (matching case)
-    tmpElement = chunkBlock.filter_by_text_contains(txtString) 
+    tmpElement = _filterByText(pdfDoc, chunkBlock, txtString) 
 
     # Check for text in upper case
     if (len(tmpElement) < 1):
-        tmpElement = chunkBlock.filter_by_text_contains(txtString.upper())
+        tmpElement = _filterByText(pdfDoc, chunkBlock, txtString.upper())
 
     # check with lower case
     if (len(tmpElement) < 1):
-        tmpElement = chunkBlock.filter_by_text_contains(txtString.lower())
+        tmpElement = _filterByText(pdfDoc, chunkBlock, txtString.lower())
             
     # Check with title case
     if (len(tmpElement) < 1):
-        tmpElement = chunkBlock.filter_by_text_contains(txtString.title())
+        tmpElement = _filterByText(pdfDoc, chunkBlock, txtString.title())
 
     data = {
         "pdfFile": pdfFile,
@@ -406,7 +672,7 @@ def findTextWithinBlock (pdfFile, txtString, start, end):
         "matchCount": len(tmpElement),
         "locations": []
     }
-    print(f'len: {len(tmpElement)}')
+    logger.debug(f'{pdfFile}: {len(tmpElement)} matches within block')
     # Get info about the matching text, if any
     if (len(tmpElement) > 0):
         for e in tmpElement:
@@ -424,6 +690,7 @@ def findTextWithinBlock (pdfFile, txtString, start, end):
 ''' Find elements that match the given pattern based on regex '''
 #####################################################################
 
+@_releasesPdf
 def findPattern (pdfFile, rePattern):
     '''
         Find a string / text pattern based on regex
@@ -438,8 +705,8 @@ def findPattern (pdfFile, rePattern):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     if (len(pdfDoc.page_numbers) == 0):
@@ -470,6 +737,7 @@ def findPattern (pdfFile, rePattern):
     return (helperFunctions.getReturnArray(len(tmpElement) > 0, errMsg, data))
 
 # TODO: Try/except or if/else for edge cases within this function (EC = Edge Case in in line comments below)
+@_releasesPdf
 def findPatternWithinBlock (pdfFile, rePattern, start, end):
     '''
         Locate text within a pdf.
@@ -486,8 +754,8 @@ def findPatternWithinBlock (pdfFile, rePattern, start, end):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     if (len(pdfDoc.page_numbers) == 0):
@@ -501,10 +769,10 @@ def findPatternWithinBlock (pdfFile, rePattern, start, end):
         return(helperFunctions.getReturnArray(False, eBlock["message"], ''))
 
     # Open the PDF file
-    pdfDoc = load_file(pdfFile) # TODO EC
+    pdfDoc = _loadPdf(pdfFile) # TODO EC
 
     # Get the chunk between the two elements # TODO EC
-    chunkBlock = pdfDoc.elements.between(eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
+    chunkBlock = _between(pdfDoc, eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
 
     # Check for regex pattern
     tmpElement = chunkBlock.filter_by_regex(rePattern)
@@ -515,7 +783,7 @@ def findPatternWithinBlock (pdfFile, rePattern, start, end):
         "matchCount": len(tmpElement),
         "locations": []
     }
-    print(f'len: {len(tmpElement)}')
+    logger.debug(f'{pdfFile}: {len(tmpElement)} matches within block')
     # Get info about the matching text, if any
     if (len(tmpElement) > 0):
         for e in tmpElement:
@@ -536,6 +804,7 @@ def findPatternWithinBlock (pdfFile, rePattern, start, end):
 '''
 #####################################################################
 
+@_releasesPdf
 def chunkByPageAsText(pdfFile):
     '''
         Chunk the PDF by page and get all elements' text
@@ -550,8 +819,8 @@ def chunkByPageAsText(pdfFile):
     '''
      # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     if (len(pdfDoc.page_numbers) == 0):
@@ -572,7 +841,7 @@ def chunkByPageAsText(pdfFile):
         page = pdfDoc.elements.filter_by_page(i+1)
 
         # Get text of the page as a chunk
-        chunkBlock = getText(pdfFile, page[0], page[len(page)-1])
+        chunkBlock = getTextFromElements(page)
 
         # Add page text as a chunk
         returnDetails = {
@@ -585,6 +854,7 @@ def chunkByPageAsText(pdfFile):
         
     return (helperFunctions.getReturnArray(True, "", data))
 
+@_releasesPdf
 def chunkByPageAsSentences(pdfFile):
     '''
         Get the entire PDF as sentences
@@ -600,8 +870,8 @@ def chunkByPageAsSentences(pdfFile):
 
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     # Check for error
@@ -622,7 +892,7 @@ def chunkByPageAsSentences(pdfFile):
         page = pdfDoc.elements.filter_by_page(i+1)
 
         # Get text of the page as sentences
-        strSentences = getSentences(pdfFile, page[0], page[len(page)-1])
+        strSentences = getSentencesFromElements(page)
         chunkSize = len(strSentences)
 
         if (chunkSize < 1):
@@ -638,6 +908,7 @@ def chunkByPageAsSentences(pdfFile):
 
     return (helperFunctions.getReturnArray(True, "", data))
 
+@_releasesPdf
 def chunkByPageAsTable(pdfFile):
     '''
         Chunk by page as table
@@ -652,8 +923,8 @@ def chunkByPageAsTable(pdfFile):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     # Check for error
@@ -674,7 +945,7 @@ def chunkByPageAsTable(pdfFile):
         page = pdfDoc.elements.filter_by_page(i+1)
 
         # Get text of the page as table
-        pageTable = getTable(pdfFile, page[0], page[len(page)-1])
+        pageTable = getTableFromElements(page)
 
         chunkSize = len(pageTable)
 
@@ -780,55 +1051,74 @@ def getImagesFromPage(pdfFile, pageNum):
     'getElementsUsingIndex' to get the PDF elements that correspond to the indexes.
 '''
 #####################################################################
-##### Get chunk between two Indexes as Text #####
-def chunkBetweenIndexAsText(pdfFile, start, end):
+##### Get chunk between two Indexes #####
+def _chunkBetween(pdfFile, start, end, kind):
     '''
-        Get images from the full PDF from a particular page number.
+        Chunk between two indexes with the extractor registered for kind in _EXTRACTORS.
     ARGS
         pdfFile (string, path): Path to PDF File.
         start (element): Starting element to begin chunking.
         end (element): Ending element to end chunking.
+        kind (string): One of 'text', 'sentences' or 'table'.
     RETURN
         returnArray (dictionary): Dictionary containing elements 'status', 'message', and 'data'.
-            status: True/False whether the function succeeded or failed
-            message: Empty string (status is True) or error message (status is False)
-            data: List of chunks containing fileName, dateCreated, chunkSize, chunkText,
-                startPage, endPage, status and errorMessage (status is True) 
-                empty string (status is False)
     '''
     # Get the start and end elements
     eBlock = getElementsUsingIndex(pdfFile, start, end)
 
     # Return in case of an error
-    if eBlock["status"] == False:
+    if (eBlock["status"] == False):
         return(helperFunctions.getReturnArray(False, eBlock["message"], ''))
 
     # Open the PDF file
-    pdfDoc = load_file(pdfFile)
+    pdfDoc = _loadPdf(pdfFile)
 
     # Get the chunk between the two elements
-    chunkText = getText(pdfFile, eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement']).strip()
-    chunkBlock = pdfDoc.elements.between(eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
+    chunkBlock = _between(pdfDoc, eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
+    chunk = _EXTRACTORS[kind](chunkBlock)
+    chunkSize = len(chunk)
 
-    # Append to array
-    if (len(chunkText) > 0):
+    if (chunkSize > 0):
         errMsg = ''
     else:
         errMsg = "No text found or error in parsing PDF"
 
-    data = {
-        "fileName": pdfFile,
-        "dateCreated": datetime.datetime.now().strftime("%Y-%m-%d"),
-        "chunkSize": len(chunkText),
-        "chunkText": chunkText,
+    # Only the text chunk carries the file details
+    data = {}
+    if (kind == 'text'):
+        data["fileName"] = pdfFile
+        data["dateCreated"] = datetime.datetime.now().strftime("%Y-%m-%d")
+
+    data.update({
+        "chunkSize": chunkSize,
+        "chunkText": chunk,
         "startPage": chunkBlock[0].page_number,
         "endPage": chunkBlock[len(chunkBlock)-1].page_number,
-        "status": (len(chunkText) > 0),
+        "status": (chunkSize > 0),
         "errorMessage": errMsg
-    }
+    })
 
-    return (helperFunctions.getReturnArray((len(chunkText) > 0), errMsg, data))
+    return (helperFunctions.getReturnArray((chunkSize > 0), errMsg, data))
 
+@_releasesPdf
+def chunkBetweenIndexAsText(pdfFile, start, end):
+    '''
+        Chunk between indexes as text.
+    ARGS
+        pdfFile (string, path): Path to PDF File.
+        start (element): Starting element to begin chunking.
+        end (element): Ending element to end chunking.
+    RETURN
+        returnArray (dictionary): Dictionary containing elements 'status', 'message', and 'data'.
+            status: True/False whether the function succeeded or failed
+            message: Empty string (status is True) or error message (status is False)
+            data: List of chunks containing fileName, dateCreated, chunkSize, chunkText,
+                startPage, endPage, status and errorMessage (status is True) 
+                empty string (status is False)
+    '''
+    return _chunkBetween(pdfFile, start, end, 'text')
+
+@_releasesPdf
 def chunkBetweenIndexAsSentences(pdfFile, start, end):
     '''
         Chunk between indexes as sentences.
@@ -844,40 +1134,12 @@ def chunkBetweenIndexAsSentences(pdfFile, start, end):
                 startPage, endPage, status and errorMessage (status is True) 
                 empty string (status is False)
     '''
-    # Get the start and end elements
-    eBlock = getElementsUsingIndex(pdfFile, start, end)
-
-    # Return in case of an error
-    if (eBlock["status"] == False):
-        return(helperFunctions.getReturnArray(False, eBlock["message"], ''))
-
-    # Open the PDF file
-    pdfDoc = load_file(pdfFile)
-
-    # Get the chunk between the two elements
-    chunkSentences = getSentences(pdfFile, eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
-    chunkBlock = pdfDoc.elements.between(eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
-
-    # Append to array
-    if (len(chunkSentences) > 0):
-        errMsg = ''
-    else:
-        errMsg = "No text found or error in parsing PDF"
-    
-    data = {
-        "chunkSize": len(chunkSentences),
-        "chunkText": chunkSentences,
-        "startPage": chunkBlock[0].page_number,
-        "endPage": chunkBlock[len(chunkBlock)-1].page_number,
-        "status": (len(chunkSentences) > 0),
-        "errorMessage": errMsg
-    }
-
-    return (helperFunctions.getReturnArray((len(chunkSentences) > 0), errMsg, data))
+    return _chunkBetween(pdfFile, start, end, 'sentences')
 
+@_releasesPdf
 def chunkBetweenIndexAsTable(pdfFile, start, end):
     '''
-        Chunk bet as table.
+        Chunk between indexes as table.
     ARGS
         pdfFile (string, path): Path to PDF File.
         start (element): Starting element to begin chunking.
@@ -890,36 +1152,7 @@ def chunkBetweenIndexAsTable(pdfFile, start, end):
                 startPage, endPage, status and errorMessage (status is True) 
                 empty string (status is False)
     '''
-    # Get the start and end elements
-    eBlock = getElementsUsingIndex(pdfFile, start, end)
-
-    # Return in case of an error
-    if (eBlock["status"] == False):
-        return(helperFunctions.getReturnArray(False, eBlock["message"], ''))
-
-    # Open the PDF file
-    pdfDoc = load_file(pdfFile)
-
-    # Get the chunk between the two elements
-    chunkTable = getTable(pdfFile, eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
-    chunkBlock = pdfDoc.elements.between(eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
-
-    # Append to array
-    if (len(chunkTable) > 0):
-        errMsg = ''
-    else:
-        errMsg = "No text found or error in parsing PDF"
-    
-    data = {
-        "chunkSize": len(chunkTable),
-        "chunkText": chunkTable,
-        "startPage": chunkBlock[0].page_number,
-        "endPage": chunkBlock[len(chunkBlock)-1].page_number,
-        "status": (len(chunkTable) > 0),
-        "errorMessage": errMsg
-    }
-
-    return (helperFunctions.getReturnArray((len(chunkTable) > 0), errMsg, data))
+    return _chunkBetween(pdfFile, start, end, 'table')
 
 ########################################################################################
 '''
@@ -927,55 +1160,103 @@ def chunkBetweenIndexAsTable(pdfFile, start, end):
 '''
 ########################################################################################
 
-def chunkPageAsText(pdfFile, pageNum):
+def _getPageTextPdfium(pdfFile, pageNum):
     '''
-        Chunk a given page as text.
+        Get the text of a page with pdfium's native text extraction. No element metadata is available on this path.
+    ARGS
+        pdfFile (string, path): Path to PDF File.
+        pageNum (int): Page number to extract (starting at 1).
+    RETURN
+        pageText (string): Stripped page text. Empty string if pypdfium2 is not installed or the page cannot be read.
+    '''
+    if not PDFIUM_AVAILABLE:
+        return ''
+
+    try:
+        pdf = pdfium.PdfDocument(pdfFile)
+    except (OSError, pdfium.PdfiumError):
+        return ''
+
+    try:
+        if (pageNum < 1 or pageNum > len(pdf)):
+            return ''
+        textPage = pdf[pageNum-1].get_textpage()
+        return textPage.get_text_bounded().replace('\r\n', '\n').strip()
+    except pdfium.PdfiumError:
+        return ''
+    finally:
+        # Closing the document also closes its pages and text pages
+        pdf.close()
+
+def _chunkPage(pdfFile, pageNum, kind):
+    '''
+        Chunk a given page with the extractor registered for kind in _EXTRACTORS.
     ARGS
         pdfFile (string, path): Path to PDF File.
         pageNum (int): Page number to extract.
+        kind (string): One of 'text', 'sentences' or 'table'.
     RETURN
         returnArray (dictionary): Dictionary containing elements 'status', 'message', and 'data'.
-            status: True/False whether the function succeeded or failed
-            message: Empty string (status is True) or error message (status is False)
-            data: List of chunks containing fileName, dateCreated,
-                pageNum, chunkSize, and chunkText (status is True) 
-                empty string (status is False)
     '''
-    # Load the PDF
-    try:
-        pdfDoc = load_file(pdfFile)
-    except:
-        return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
+    # Read the page text natively with pdfium, without parsing the whole PDF into elements
+    chunk = _getPageTextPdfium(pdfFile, pageNum) if (kind == 'text') else []
 
-    # Check for error
-    if (len(pdfDoc.page_numbers) == 0):
-        return(helperFunctions.getReturnArray(False, "Error in reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
+    # Fall back to the PDF elements
+    if (len(chunk) == 0):
+        # Load the PDF
+        try:
+            pdfDoc = _loadPdf(pdfFile)
+        except _PDF_OPEN_ERRORS:
+            return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
-    # Filter the PDF by page & get the sentences
-    try:
-        page = pdfDoc.elements.filter_by_page(pageNum)
-    except:
-        return(helperFunctions.getReturnArray(False, "Page not found or unable to read page", ""))
+        # Check for error
+        if (len(pdfDoc.page_numbers) == 0):
+            return(helperFunctions.getReturnArray(False, "Error in reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
+
+        # Filter the PDF by page
+        try:
+            page = pdfDoc.elements.filter_by_page(pageNum)
+        except PageNotFoundError:
+            return(helperFunctions.getReturnArray(False, "Page not found or unable to read page", ""))
 
-    # Get page text
-    pageText = getText(pdfFile, page[0], page[len(page)-1]).strip()
+        chunk = _EXTRACTORS[kind](page)
 
-    if (len(pageText) > 0):
+    chunkSize = len(chunk)
+
+    if (chunkSize > 0):
         errMsg = ''
     else:
         errMsg = "No text found or error in parsing PDF"
-    
+
     data = {
         "fileName": pdfFile,
         "dateCreated": datetime.datetime.now().strftime("%Y-%m-%d"),
         "pageNum": pageNum,
-        "chunkSize": len(pageText),
-        "chunkText": pageText
+        "chunkSize": chunkSize,
+        "chunkText": chunk
     }
-        
-    return (helperFunctions.getReturnArray((len(pageText) > 0), errMsg, data))
+
+    return (helperFunctions.getReturnArray((chunkSize > 0), errMsg, data))
+
+@_releasesPdf
+def chunkPageAsText(pdfFile, pageNum):
+    '''
+        Chunk a given page as text.
+    ARGS
+        pdfFile (string, path): Path to PDF File.
+        pageNum (int): Page number to extract.
+    RETURN
+        returnArray (dictionary): Dictionary containing elements 'status', 'message', and 'data'.
+            status: True/False whether the function succeeded or failed
+            message: Empty string (status is True) or error message (status is False)
+            data: List of chunks containing fileName, dateCreated,
+                pageNum, chunkSize, and chunkText (status is True) 
+                empty string (status is False)
+    '''
+    return _chunkPage(pdfFile, pageNum, 'text')
 
 ##### Chunk a specified page as sentences
+@_releasesPdf
 def chunkPageAsSentences(pdfFile, pageNum):
     '''
         Chunk a given page as sentences.
@@ -990,43 +1271,12 @@ def chunkPageAsSentences(pdfFile, pageNum):
                 pageNum, chunkSize, and chunkText (status is True) 
                 empty string (status is False)
     '''
-    # Load the PDF
-    try:
-        pdfDoc = load_file(pdfFile)
-    except:
-        return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
-
-    # Check for error
-    if (len(pdfDoc.page_numbers) == 0):
-        return(helperFunctions.getReturnArray(False, "Error in reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
-
-    # Filter the PDF by page & get the sentences
-    try:
-        page = pdfDoc.elements.filter_by_page(pageNum)
-    except:
-        return(helperFunctions.getReturnArray(False, "Page not found or unable to read page", ""))
-
-    # Get page text
-    pageSentences = getSentences(pdfFile, page[0], page[len(page)-1])
-
-    if (len(pageSentences) > 0):
-        errMsg = ''
-    else:
-        errMsg = "No text found or error in parsing PDF"
-
-    data = {
-        "fileName": pdfFile,
-        "dateCreated": datetime.datetime.now().strftime("%Y-%m-%d"),
-        "pageNum": pageNum,
-        "chunkSize": len(pageSentences),
-        "chunkText": pageSentences
-    }
-
-    return (helperFunctions.getReturnArray((len(pageSentences) > 0), errMsg, data))
+    return _chunkPage(pdfFile, pageNum, 'sentences')
 
+@_releasesPdf
 def chunkPageAsTable(pdfFile, pageNum):
     '''
-        Chunk a specified page as table.
+        Chunk a given page as table.
     ARGS
         pdfFile (string, path): Path to PDF File.
         pageNum (int): Page number to extract.
@@ -1038,40 +1288,7 @@ def chunkPageAsTable(pdfFile, pageNum):
                 pageNum, chunkSize, and chunkText (status is True) 
                 empty string (status is False)
     '''
-    # Load the PDF
-    try:
-        pdfDoc = load_file(pdfFile)
-    except:
-        return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
-
-    # Check for error
-    if (len(pdfDoc.page_numbers) == 0):
-        return(helperFunctions.getReturnArray(False, "Error in reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
-
-    # Filter the PDF by page
-    try:
-        page = pdfDoc.elements.filter_by_page(pageNum)
-    except:
-        return(helperFunctions.getReturnArray(False, "Page not found or unable to read page", ""))
-
-    # Get page text
-    pageTable = getTable(pdfFile, page[0], page[len(page)-1])
-
-    if (len(pageTable) > 1):
-        errMsg = ''
-    else:
-        errMsg = "No text found or error in parsing PDF"
-
-    # Add the table block of the page (list) as a chunk
-    data = {
-        "fileName": pdfFile,
-        "dateCreated": datetime.datetime.now().strftime("%Y-%m-%d"),
-        "pageNum": pageNum,
-        "chunkSize": len(pageTable),
-        "chunkText": pageTable
-    }
-
-    return (helperFunctions.getReturnArray((len(pageTable) > 0), errMsg, data))
+    return _chunkPage(pdfFile, pageNum, 'table')
 
 ##############################################################################################
 '''
@@ -1082,6 +1299,41 @@ def chunkPageAsTable(pdfFile, pageNum):
 '''
 ##############################################################################################
 
+def _mergeSections(docSections, lastElement):
+    '''
+        Build the table for document sections from the start rows of the present chunks.
+    ARGS
+        docSections (list of Section): Present chunks sorted by start index. End index, element and page are not set yet.
+        lastElement (element): Element that ends the last chunk.
+    RETURN
+        mergedSections (list of Section): One row per chunk, ending where the next chunk (with a different code) starts.
+    '''
+    mergedSections = []
+    if (len(docSections) == 0):
+        return mergedSections
+
+    # Capture the first element in first row
+    tmpElement = docSections[0]
+
+    # Walk consecutive rows once; 'prev' is the row just before 'row'
+    for prev, row in zip(docSections, docSections[1:]):
+        if (tmpElement.code != row.code):
+            if (tmpElement.found == True):
+                endPage = row.startElement.page_number
+            else:
+                endPage = row.endPage
+            mergedSections.append(Section(tmpElement.code, tmpElement.found, tmpElement.startIndex, row.startIndex, tmpElement.startElement, row.startElement,
+                                          prev.errorMessage, prev.fileName, prev.name, prev.startPage, endPage))
+            tmpElement = row
+
+    # Add last row
+    last = docSections[-1]
+    mergedSections.append(Section(tmpElement.code, tmpElement.found, tmpElement.startIndex, lastElement._index, tmpElement.startElement, lastElement,
+                                  last.errorMessage, last.fileName, last.name, last.startPage, lastElement.page_number))
+
+    return mergedSections
+
+@_releasesPdf
 def getChunksInfo(pdfFile, cfgFile):
     '''
         Get the start and end index information of all chunks as defined in config file. This information is used by most methods of this service.
@@ -1096,133 +1348,94 @@ def getChunksInfo(pdfFile, cfgFile):
     '''
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
-        print('e1')
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS as e:
+        logger.debug(f"Error in opening the PDF file {pdfFile}: {e}")
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     # Check for error
     if (len(pdfDoc.page_numbers) == 0):
-        print('e2')
+        logger.debug(f"No pages read from the PDF file {pdfFile}")
         return(helperFunctions.getReturnArray(False, "Error in reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
 
     # Load the JSON config file
     try:
-        f = open(cfgFile)
-        data = json.load(f)
-        f.close()
-    except Exception as e:
-        print(e)
+        data = _loadConfig(cfgFile, os.path.getmtime(cfgFile))
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.debug(f"Error in opening the config file {cfgFile}: {e}")
         return(helperFunctions.getReturnArray(False, "Error in opening the config file: " + cfgFile, ''))
 
     # Extract the config in a list
     pdfChunks = data["chunks"]
 
-    # Document sections will be a list of lists
+    # Document sections will be a list of Section rows
     docSections = []
 
     # As the text can be in lower, upper or title case; we need to check for all three variations
     for chunk in pdfChunks:
         if len(chunk["startsWith"]) > 1:
-            print('G1')
             # Check for text as is (matching case)
-            tmpElement = pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][0]) and pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][1])
+            tmpElement = _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][0]) and _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][1])
 
             # Check with upper case
             if (len(tmpElement) < 1):
-                tmpElement = pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][0].upper()) and pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][1].upper())
+                tmpElement = _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][0].upper()) and _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][1].upper())
 
             # Check with lower case
             if (len(tmpElement) < 1):
-                tmpElement = pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][0].lower()) and pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][1].lower())
+                tmpElement = _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][0].lower()) and _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][1].lower())
 
             # Check with title case
             if (len(tmpElement) < 1):
-                tmpElement = pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][0].title()) and pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][1].title())
+                tmpElement = _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][0].title()) and _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][1].title())
 
         else:
 
             #Start with macthing case
-            tmpElement = pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][0])
+            tmpElement = _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][0])
 
             # Check with upper case
             if (len(tmpElement) < 1):
-                tmpElement = pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][0].upper())
+                tmpElement = _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][0].upper())
 
             # check with lower case
             if (len(tmpElement) < 1):
-                tmpElement = pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][0].lower())
+                tmpElement = _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][0].lower())
             
             # Check with title case
             if (len(tmpElement) < 1):
-                tmpElement = pdfDoc.elements.filter_by_text_contains(chunk["startsWith"][0].title())
+                tmpElement = _filterByText(pdfDoc, pdfDoc.elements, chunk["startsWith"][0].title())
 
         # For blocks that may occur more than once
         if (chunk["isMultiple"] == 'True'):
             for te in tmpElement:
-                docSections.append([chunk["code"], True, te._index, 0, te, '', '', pdfFile, chunk["name"], te.page_number, 0])
+                docSections.append(Section(chunk["code"], True, te._index, 0, te, '', '', pdfFile, chunk["name"], te.page_number, 0))
         else:
             if (len(tmpElement) > 1):
-                docSections.append([chunk["code"], True, tmpElement[0]._index, 0, tmpElement[0], '', 'WARNING: There may be more than one ' + chunk["name"] + ' sections: ' + str(len(tmpElement)), pdfFile, chunk["name"],tmpElement[0].page_number, 0])
+                docSections.append(Section(chunk["code"], True, tmpElement[0]._index, 0, tmpElement[0], '', 'WARNING: There may be more than one ' + chunk["name"] + ' sections: ' + str(len(tmpElement)), pdfFile, chunk["name"],tmpElement[0].page_number, 0))
                 #print (f"Found {len(tmpElement)} chunks that starts with: {chunk['startsWith']} on page {tmpElement[0].page_number}")
             elif (len(tmpElement) == 1):
-                docSections.append([chunk["code"], True, tmpElement[0]._index, 0, tmpElement[0], '', '', pdfFile, chunk["name"], tmpElement[0].page_number, 0])
+                docSections.append(Section(chunk["code"], True, tmpElement[0]._index, 0, tmpElement[0], '', '', pdfFile, chunk["name"], tmpElement[0].page_number, 0))
                 #print (f"Found {len(tmpElement)} chunks that starts with: {chunk['startsWith']} on page {tmpElement[0].page_number}")
             else:
                 #print (f"Did not find any chunk that starts with: {chunk['startsWith']}")
                 if (chunk["isOptional"] == 'False'):
-                    docSections.append([chunk["code"], False, -1, -1, '', '', 'ERROR: ' + chunk["name"] + " block is missing", pdfFile, chunk["name"], 0, 0])
+                    docSections.append(Section(chunk["code"], False, -1, -1, '', '', 'ERROR: ' + chunk["name"] + " block is missing", pdfFile, chunk["name"], 0, 0))
 
     # Sort the sections based on start index value
-    docSections.sort(key = lambda x: x[2])
-
-    # Build the final sorted list of all present chunks
-    finalSections = []
+    docSections.sort(key = _sectionStart)
 
-    # Capture and remove all 'False' chunks
-    for i in range(len(docSections)):
-        try:
-            if (docSections[i][1] == False):
-                finalSections.append(docSections[i])
-                del docSections[i]
-        except Exception:
-            pass
+    # Split into the missing chunks, which go first in the final list, and the present chunks
+    finalSections = [row for row in docSections if row.found == False]
+    docSections = [row for row in docSections if row.found == True]
 
-    # Capture the first element in first row
-    #print (docSections)
-    tmpElement = docSections[0]
-
-    '''
-        Build the table for document sections. Array elements:
-        [0] = Code (See JSON)
-        [1] = True (If the chunk is present)
-        [2] = Start Index of the chunk
-        [3] = End index of the chunk
-        [4] = Start element of the chunk
-        [5] = End element of the chunk
-        [6] = Error message, if any (related to entire chunk)
-        [7] = PDF file name
-        [8] = Chunk name
-        [9] = Start page
-        [10] = End page
-    '''
-    
-    for i in range(len(docSections)):
-        if (tmpElement[0] == docSections[i][0]):
-            pass
-        else:
-            if (tmpElement[1] == True):
-                #print([tmpElement[0], tmpElement[1], tmpElement[2], docSections[i][2], tmpElement[4], docSections[i][4], docSections[i-1][6], docSections[i-1][7], docSections[i-1][8], docSections[i-1][9], docSections[i][4].page_number])
-                finalSections.append([tmpElement[0], tmpElement[1], tmpElement[2], docSections[i][2], tmpElement[4], docSections[i][4], docSections[i-1][6], docSections[i-1][7], docSections[i-1][8], docSections[i-1][9], docSections[i][4].page_number])
-            else:
-                #print([tmpElement[0], tmpElement[1], tmpElement[2], docSections[i][2], tmpElement[4], docSections[i][4], docSections[i-1][6], docSections[i-1][7], docSections[i-1][8], docSections[i-1][9], docSections[i][10]])
-                finalSections.append([tmpElement[0], tmpElement[1], tmpElement[2], docSections[i][2], tmpElement[4], docSections[i][4], docSections[i-1][6], docSections[i-1][7], docSections[i-1][8], docSections[i-1][9], docSections[i][10]])
-            tmpElement = docSections[i]
+    # Nothing in the config matched the PDF
+    if (len(docSections) == 0):
+        return helperFunctions.getReturnArray(False, "No chunks matched config", '')
 
-    # Add last row
+    # Close each chunk at the start of the next one and the last chunk at the end of the PDF
     allElements = pdfDoc.elements
-    finalSections.append([tmpElement[0], tmpElement[1], tmpElement[2], allElements[len(allElements)-1]._index, tmpElement[4], allElements[len(allElements)-1], docSections[i][6], docSections[i][7], docSections[i][8], docSections[i][9], allElements[len(allElements)-1].page_number])
-    #print ([tmpElement[0], tmpElement[1], tmpElement[2], allElements[len(allElements)-1]._index, tmpElement[4], allElements[len(allElements)-1], docSections[i][6], docSections[i][7], docSections[i][8], docSections[i][9], allElements[len(allElements)-1].page_number])
+    finalSections.extend(_mergeSections(docSections, allElements[len(allElements)-1]))
 
     data = {
         "fileName": pdfFile,
@@ -1236,20 +1449,21 @@ def getChunksInfo(pdfFile, cfgFile):
         #print (row)
         chunkDetails = {
             "chunkID": len(data["chunks"]),
-            "chunkCode": row[0],
-            "chunkName": row[8],
-            "isFound": row[1],
-            "startIndex": row[2],
-            "endIndex": row[3],
-            "errorMessage": row[6],
-            "startPage": row[9],
-            "endPage": row[10]
+            "chunkCode": row.code,
+            "chunkName": row.name,
+            "isFound": row.found,
+            "startIndex": row.startIndex,
+            "endIndex": row.endIndex,
+            "errorMessage": row.errorMessage,
+            "startPage": row.startPage,
+            "endPage": row.endPage
         }
 
         data["chunks"].append(chunkDetails)
 
     return helperFunctions.getReturnArray(True, "", data)
 
+@_releasesPdf
 def getChunksAsText(pdfFile, cfgFile):
     '''
         Method to extract chunks as text using the config file for chunk blocks.
@@ -1282,11 +1496,11 @@ def getChunksAsText(pdfFile, cfgFile):
         if (chunk["isFound"] == True):
             # Get start and end elements of the chunk
             eleBlock = getElementsUsingIndex(pdfFile, chunk["startIndex"], chunk["endIndex"])
-            chunkText = getText(pdfFile, eleBlock['data'][0]['startElement'], eleBlock['data'][0]['endElement']).strip()
+            chunkText = getText(pdfFile, eleBlock['data'][0]['startElement'], eleBlock['data'][0]['endElement'])
 
         # Append to array
-        chunkText = chunkText.strip()
-        if (len(chunkText) > 0):
+        chunkSize = len(chunkText)
+        if (chunkSize > 0):
             errMsg = ''
         else:
             errMsg = "No text found"
@@ -1295,11 +1509,11 @@ def getChunksAsText(pdfFile, cfgFile):
             "chunkID": chunk["chunkID"],
             "chunkCode": chunk["chunkCode"],
             "chunkName": chunk["chunkName"],
-            "chunkSize": len(chunkText),
+            "chunkSize": chunkSize,
             "chunkText": chunkText,
             "startPage": chunk["startPage"],
             "endPage": chunk["endPage"],
-            "status": (len(chunkText) > 0),
+            "status": (chunkSize > 0),
             "errorMessage": errMsg
         }
 
@@ -1307,6 +1521,7 @@ def getChunksAsText(pdfFile, cfgFile):
 
     return (helperFunctions.getReturnArray(True, "", data))
 
+@_releasesPdf
 def getChunksAsSentences(pdfFile, cfgFile):
     '''
         Method to extract chunks as sentences using the config file for chunk blocks.
@@ -1341,7 +1556,7 @@ def getChunksAsSentences(pdfFile, cfgFile):
         else:
             chunkName = chunk['chunkName']
             errMsg = f'{chunkName} was not found with getChunksInfo().'
-            print(errMsg)
+            logger.debug(errMsg)
             chunkSentences = []            
 
         # Append to array
@@ -1366,6 +1581,7 @@ def getChunksAsSentences(pdfFile, cfgFile):
     return helperFunctions.getReturnArray(True, "", data)
 
 ##### Method to extract chunks as table #####
+@_releasesPdf
 def getChunksAsTable(pdfFile, cfgFile):
     '''
         Method to extract chunks as table using the config file for chunk blocks.
@@ -1424,6 +1640,7 @@ def getChunksAsTable(pdfFile, cfgFile):
 '''
 ################################################################################################################################
 
+@_releasesPdf
 def getChunkInfoByWords(pdfFile, start, end, listOfWords):
     '''
         Method to get chunks info using list of words.
@@ -1451,8 +1668,8 @@ def getChunkInfoByWords(pdfFile, start, end, listOfWords):
 
     # Load the PDF
     try:
-        pdfDoc = load_file(pdfFile)
-    except:
+        pdfDoc = _loadPdf(pdfFile)
+    except _PDF_OPEN_ERRORS:
         return(helperFunctions.getReturnArray(False, "Error in opening the PDF file: " + pdfFile, ''))
 
     # Check for error
@@ -1460,74 +1677,39 @@ def getChunkInfoByWords(pdfFile, start, end, listOfWords):
         return(helperFunctions.getReturnArray(False, "Error in reading the PDF file: " + pdfFile + ". It may be corrupted, or a scanned PDF or an image", ''))
 
     # Filter the elements block
-    blockElements = pdfDoc.elements.between(eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
+    blockElements = _between(pdfDoc, eBlock['data'][0]['startElement'], eBlock['data'][0]['endElement'])
     # print(blockElements)
-    # Document sections will be a list of lists
+    # Document sections will be a list of Section rows
     docSections = []
 
     for chunk in listOfWords:
-        tmpElement = blockElements.filter_by_text_contains(chunk)
+        tmpElement = _filterByText(pdfDoc, blockElements, chunk)
         # print(tmpElement)
         # print(len(tmpElement))
         # Check for the occurences of the word
         if (len(tmpElement) > 1):
-            docSections.append([chunk, True, tmpElement[0]._index, 0, tmpElement[0], '', 'WARNING: There may be more than one ' + chunk + ' sections: ' + str(len(tmpElement)), pdfFile, chunk, tmpElement[0].page_number, 0])
+            docSections.append(Section(chunk, True, tmpElement[0]._index, 0, tmpElement[0], '', 'WARNING: There may be more than one ' + chunk + ' sections: ' + str(len(tmpElement)), pdfFile, chunk, tmpElement[0].page_number, 0))
             # print (f"Found {len(tmpElement)} chunks that contains: {chunk} on page {tmpElement[0].page_number}")
         elif (len(tmpElement) == 1):
-            docSections.append([chunk, True, tmpElement[0]._index, 0, tmpElement[0], '', '', pdfFile, chunk, tmpElement[0].page_number, 0])
+            docSections.append(Section(chunk, True, tmpElement[0]._index, 0, tmpElement[0], '', '', pdfFile, chunk, tmpElement[0].page_number, 0))
             # print (f"Found {len(tmpElement)} chunks that contains: {chunk} on page {tmpElement[0].page_number}")
         else:
             # print (f"Did not find any chunk that contains: {chunk}")
-            docSections.append([chunk, False, -1, -1, '', '', 'ERROR: ' + chunk + " is missing", pdfFile, chunk, 0, 0])
+            docSections.append(Section(chunk, False, -1, -1, '', '', 'ERROR: ' + chunk + " is missing", pdfFile, chunk, 0, 0))
 
     # Sort the sections based on start index value
-    docSections.sort(key = lambda x: x[2])
+    docSections.sort(key = _sectionStart)
 
-    # Build the final sorted list of all present chunks
-    finalSections = []
+    # Split into the missing chunks, which go first in the final list, and the present chunks
+    finalSections = [row for row in docSections if row.found == False]
+    docSections = [row for row in docSections if row.found == True]
 
-    # Capture and remove all 'False' chunks
-    for i in range(len(docSections)):
-        try:
-            if (docSections[i][1] == False):
-                finalSections.append(docSections[i])
-                del docSections[i]
-        except:
-            pass
+    # None of the words were found within the block
+    if (len(docSections) == 0):
+        return helperFunctions.getReturnArray(False, "No chunks matched list of words", '')
 
-    # Capture the first element in first row
-    tmpElement = docSections[0]
-
-    '''
-        Build the table for document sections. Array elements:
-        [0] = Code (See JSON)
-        [1] = True (If the chunk is present)
-        [2] = Start Index of the chunk
-        [3] = End index of the chunk
-        [4] = Start element of the chunk
-        [5] = End element of the chunk
-        [6] = Error message, if any (related to entire chunk)
-        [7] = PDF file name
-        [8] = Chunk name
-        [9] = Start page
-        [10] = End page
-    '''
-
-    for i in range(len(docSections)):
-        if (tmpElement[0] == docSections[i][0]):
-            pass
-        else:
-            if (tmpElement[1] == True):
-                #print([tmpElement[0], tmpElement[1], tmpElement[2], docSections[i][2], tmpElement[4], docSections[i][4], docSections[i-1][6], docSections[i-1][7], docSections[i-1][8], docSections[i-1][9], docSections[i][4].page_number])
-                finalSections.append([tmpElement[0], tmpElement[1], tmpElement[2], docSections[i][2], tmpElement[4], docSections[i][4], docSections[i-1][6], docSections[i-1][7], docSections[i-1][8], docSections[i-1][9], docSections[i][4].page_number])
-            else:
-                #print([tmpElement[0], tmpElement[1], tmpElement[2], docSections[i][2], tmpElement[4], docSections[i][4], docSections[i-1][6], docSections[i-1][7], docSections[i-1][8], docSections[i-1][9], docSections[i][10]])
-                finalSections.append([tmpElement[0], tmpElement[1], tmpElement[2], docSections[i][2], tmpElement[4], docSections[i][4], docSections[i-1][6], docSections[i-1][7], docSections[i-1][8], docSections[i-1][9], docSections[i][10]])
-            tmpElement = docSections[i]
-
-    # print(blockElements)
-    # Add last row
-    finalSections.append([tmpElement[0], tmpElement[1], tmpElement[2], blockElements[len(blockElements)-1]._index, tmpElement[4], blockElements[len(blockElements)-1], docSections[i][6], docSections[i][7], docSections[i][8], docSections[i][9], blockElements[len(blockElements)-1].page_number])
+    # Close each chunk at the start of the next one and the last chunk at the end of the block
+    finalSections.extend(_mergeSections(docSections, blockElements[len(blockElements)-1]))
 
     data = {
         "fileName": pdfFile,
@@ -1540,14 +1722,14 @@ def getChunkInfoByWords(pdfFile, start, end, listOfWords):
         #print (row)
         chunkDetails = {
             "chunkID": len(data["chunks"]),
-            "chunkCode": row[0],
-            "chunkName": row[8],
-            "isFound": row[1],
-            "startIndex": row[2],
-            "endIndex": row[3],
-            "errorMessage": row[6],
-            "startPage": row[9],
-            "endPage": row[10]
+            "chunkCode": row.code,
+            "chunkName": row.name,
+            "isFound": row.found,
+            "startIndex": row.startIndex,
+            "endIndex": row.endIndex,
+            "errorMessage": row.errorMessage,
+            "startPage": row.startPage,
+            "endPage": row.endPage
         }
 
         data["chunks"].append(chunkDetails)
@@ -3,13 +3,28 @@ import json
 import pandas as pd
 import os
 import filetype
+import fitz
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
-from pdfminer.high_level import extract_text
 from src.helperFunctions import getReturnArray
 from src.scannedFilesExtraction import processScannedFile
 from src.nonScannedFilesExtraction import processNonScannedFile
 from src.chunkPDFs import findText
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Read the .env file once per process
+load_dotenv()
+_DISCOVER_CFG = os.getenv('DISCOVER_CONFIG_FILE_PATH')
+_BATCH_LABEL = os.getenv('BATCH_LABEL')
+_OUTPUT_PATH = os.getenv('OUTPUT_PATH')
+_COUNT_THRESHOLD = os.getenv('COUNT_THRESHOLD')
+
 def checkFolderAndConfig(folder):
     '''
         Checks if any folder exists and if the DiscoverFilesConfig.json file exists and can be opened.
@@ -22,31 +37,47 @@ def checkFolderAndConfig(folder):
     if not os.path.exists(folder):
         return getReturnArray(False, "No such folder: " + folder, "")
     
-    load_dotenv()
     # Try to open the config file and read the config
     try:
-        f = open(os.getenv('DISCOVER_CONFIG_FILE_PATH'))
+        f = open(_DISCOVER_CFG)
         data = json.load(f)
         f.close()
+        data[0]["_extIndex"] = _buildExtIndex(data)
     except Exception:
         return getReturnArray(False, "Could not read the config file (configDiscoverFiles.json) in the brr directory", None)
 
     return getReturnArray(True, "", data)
 
 
-def getFileDetails(fileName, extConfig):
+def _buildExtIndex(extConfig):
+    '''
+        Build the extension to mime lookup from the config file types. The first entry wins for repeated extensions.
+    ARGS:
+        extConfig (json file): Extension configuration file.
+    RETURN:
+        extIndex (dict): Lowercase extension -> mime.
+    '''
+    extIndex = {}
+    for fileType in extConfig[0]["fileTypes"]:
+        extIndex.setdefault(fileType['extension'].lower(), fileType["mime"])
+    return extIndex
+
+
+def getFileDetails(entry, extConfig):
     '''
         Get file details. The function uses 'filetype' library and exceptions are managed using config file
     ARGS:
-        fileName (string): Name of the file to scan.
+        entry (os.DirEntry or string): Directory entry (from os.scandir) or path of the file to scan.
         extConfig (json file): Extension configuration file. Default: 's2iConfig\\s2iDiscoverFilesConfig.json'
     RETURN:
         Return returnArray -> data: File details in dictionary form.
     '''
-    # Check if file exists
-    if os.path.exists(fileName):
-        pass
-    else:
+    # Reuse the stat cached on the directory entry; plain paths are stat'ed once here
+    isEntry = isinstance(entry, os.DirEntry)
+    fileName = entry.path if isEntry else entry
+    try:
+        fileSize = entry.stat().st_size if isEntry else os.stat(fileName).st_size
+    except OSError:
         return getReturnArray(False, "No such file - " + fileName, "")
 
     # Get file details
@@ -58,7 +89,7 @@ def getFileDetails(fileName, extConfig):
     }
 
     # Update the file size in KB
-    fileDetails.update({"size": round(os.path.getsize(fileName) / 1000, 2)})
+    fileDetails.update({"size": round(fileSize / 1000, 2)})
 
     # Guess the type. If the plugin does not have the type then search in our config file
     try:
@@ -67,21 +98,13 @@ def getFileDetails(fileName, extConfig):
         kind = None
 
     if kind is None:
-        isFound = False
-        ext = fileName.rsplit('.')
-        if len(ext) == 1:
-            ext = ""
-        else:
-            ext = ext[len(ext) - 1]
-            for i in range (len(extConfig[0]["fileTypes"])):
-                if extConfig[0]["fileTypes"][i]['extension'] == ext:
-                    fileDetails.update({"type": ext})
-                    fileDetails.update({"format": extConfig[0]["fileTypes"][i]["mime"]})
-                    isFound = True
-                    break
-        if not isFound:
-            fileDetails.update({"type": ext})
-            fileDetails.update({"format": "unknown"})
+        ext = os.path.splitext(fileName)[1].lstrip('.').lower()
+        extIndex = extConfig[0].get("_extIndex")
+        if extIndex is None:
+            extIndex = _buildExtIndex(extConfig)
+        mime = extIndex.get(ext) if ext else None
+        fileDetails.update({"type": ext})
+        fileDetails.update({"format": mime if mime is not None else "unknown"})
     else:
         fileDetails.update({"type": kind.extension})
         fileDetails.update({"format": kind.mime})
@@ -108,7 +131,9 @@ def scanDir(dir):
 
         # Get file details
         data = []
-        for file in os.scandir(dir):
+        with os.scandir(dir) as entries:
+            entries = list(entries)
+        for file in entries:
             if file.is_dir():
                 fileDetails = {
                     "name": file.name,
@@ -116,8 +141,16 @@ def scanDir(dir):
                     "type": "dir",
                     "format": ""
                 }
+            elif file.name.lower().endswith('.pdf'):
+                # Trust the extension for PDFs and skip reading the file header
+                fileDetails = {
+                    "name": file.name,
+                    "size": round(file.stat().st_size / 1000, 2),
+                    "type": "pdf",
+                    "format": "application/pdf"
+                }
             else:
-                fd = getFileDetails(dir + "/" + file.name, configData["data"])
+                fd = getFileDetails(file, configData["data"])
                 fileDetails = {
                     "name": file.name,
                     "size": fd["data"][0]["size"],
@@ -139,27 +172,21 @@ def readFiles(batchFolder):
         Return returnArray -> data: list of PDF file details (dictionary).
   """
   try:
-    load_dotenv()
     files = scanDir(batchFolder)
     if files['status'] is False:
       return getReturnArray(False, files['message'], None)
-    data = files['data']
-    removeFiles = []
-    for idx, item in enumerate(data):
-        if item['type'] == 'pdf':
-            name = item['name']
-            fullPath = batchFolder + '/' + name
-            item['fullPath'] = fullPath
-        else:
-          removeFiles.append(idx)
-    data = [data[idx] for idx in range(len(data)) if idx not in removeFiles]
+    # Keep only the PDF files, with their full path
+    data = [
+        {**item, 'fullPath': os.path.join(batchFolder, item['name'])}
+        for item in files['data'] if item['type'] == 'pdf'
+    ]
 
     # Configure montage for final data montage
     montage = getReturnArray(True, '', None)
     montage['data'] = [
         {
-            'label': os.getenv('BATCH_LABEL'),  # Add batchLabel set previously
-            'montagePath': os.getenv('OUTPUT_PATH'),
+            'label': _BATCH_LABEL,  # Add batchLabel set previously
+            'montagePath': _OUTPUT_PATH,
             'batch': data,
             }
 
@@ -231,6 +258,30 @@ def checkVerificationFields(verificationOutputPath):
         return getReturnArray(False, f"Failed to check verification fields: {e}", [])
 
 
+def _classifyOne(file, countThreshold):
+  """
+    Classifies a single PDF file as scanned or normal from the word count of its first page.
+    ARGS
+        file (string): Path to the PDF file.
+        countThreshold (int): Minimum number of words for the file to be considered normal.
+    RETURN
+        (file, type): type is 'normal', 'scanned' or None if the file is unreadable or has no text.
+  """
+  try:
+    with fitz.open(file) as doc:
+      text = doc.load_page(0).get_text("text") if doc.page_count else ""
+  except Exception as e:
+    # Skip files that cannot be parsed as valid PDFs without failing the whole batch
+    print(f"Warning: Skipping unreadable PDF '{file}': {e}")
+    return file, None
+  if len(text):
+    wordCount = len(text.strip().split())
+    if wordCount>=countThreshold:
+      return file, 'normal'
+    return file, 'scanned'
+  return file, None
+
+
 def classifyFiles(batchFolder):
 
   """
@@ -242,7 +293,6 @@ def classifyFiles(batchFolder):
   """
 
   try:
-    load_dotenv()
     scannedFiles = []
     normalFiles = []
     # Get settings from Montage structure
@@ -254,18 +304,12 @@ def classifyFiles(batchFolder):
     if not batchConfig['status']:
       return getReturnArray(False, batchConfig['message'], None)
     pdfBatch = batchConfig['data']
-    for file in pdfBatch:
-      try:
-        text = extract_text(file, page_numbers=[0])
-      except Exception as e:
-        # Skip files that cannot be parsed as valid PDFs without failing the whole batch
-        print(f"Warning: Skipping unreadable PDF '{file}': {e}")
-        continue
-      if len(text):
-        wordCount = len(text.strip().split())
-        if wordCount>=int(os.getenv('COUNT_THRESHOLD')):
+    countThreshold = int(_COUNT_THRESHOLD)
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+      for file, fileType in executor.map(_classifyOne, pdfBatch, [countThreshold] * len(pdfBatch), chunksize=4):
+        if fileType == 'normal':
           normalFiles.append(file)
-        else:
+        elif fileType == 'scanned':
           scannedFiles.append(file)
 
     data = {
@@ -331,6 +375,66 @@ def scanDocument(fileName, fileType, DocumentTermsMap,outputFilePath):
         return getReturnArray(False, f"Error during scanning document terms: {e}", None)
 
 
+@lru_cache(maxsize=8)
+def _termsAutomaton(termsKey):
+    """
+        Build an Aho-Corasick automaton over the lowercased terms of all documents.
+        Args:
+            termsKey (tuple): Tuple of (document name, tuple of terms) pairs.
+        Returns:
+            (automaton, alwaysMatched): automaton values are the list of (document name, term index) for each term.
+            alwaysMatched holds the (document name, term index) of empty terms, which match any text.
+    """
+    entries = {}
+    alwaysMatched = []
+    for docName, terms in termsKey:
+        for i, term in enumerate(terms):
+            term = term.lower()
+            if term:
+                entries.setdefault(term, []).append((docName, i))
+            else:
+                alwaysMatched.append((docName, i))
+
+    automaton = ahocorasick.Automaton()
+    for term, docTerms in entries.items():
+        automaton.add_word(term, docTerms)
+    if entries:
+        automaton.make_automaton()
+    return automaton, alwaysMatched
+
+
+@lru_cache(maxsize=8)
+def _lowerTerms(termsKey):
+    """
+        Lowercase the terms of all documents once for the substring scan.
+        Args:
+            termsKey (tuple): Tuple of (document name, tuple of terms) pairs.
+        Returns:
+            lowerTerms (dict): Document name to tuple of lowercased terms, in the original order.
+    """
+    return {docName: tuple(t.lower() for t in terms) for docName, terms in termsKey}
+
+
+def _matchTerms(extractedText, termsKey):
+    """
+        Find the terms of each document that occur in the text.
+        Args:
+            extractedText (str): Lowercased text extracted from the PDF file.
+            termsKey (tuple): Tuple of (document name, tuple of terms) pairs.
+        Returns:
+            hits (dict): Document name to set of indexes of its matched terms.
+    """
+    automaton, alwaysMatched = _termsAutomaton(termsKey)
+    hits = {}
+    for docName, i in alwaysMatched:
+        hits.setdefault(docName, set()).add(i)
+    if len(automaton):
+        for _, docTerms in automaton.iter(extractedText):
+            for docName, i in docTerms:
+                hits.setdefault(docName, set()).add(i)
+    return hits
+
+
 def searchTerms(fullFilePath, baseFileName, fileType, extractedText, termsJson, extractedTextFilePath):
     """
         Match documents with terms using findText function.
@@ -349,14 +453,29 @@ def searchTerms(fullFilePath, baseFileName, fileType, extractedText, termsJson,
         bestProbablity = 0.0
         bestMatched = []
 
+        termsKey = tuple((docName, tuple(terms)) for docName, terms in termsJson.items())
+        if AHOCORASICK_AVAILABLE:
+            # Find the indexes of all matched terms of every document in a single pass over the text
+            hits = _matchTerms(extractedText, termsKey)
+        else:
+            hits = None
+            lowerTerms = _lowerTerms(termsKey)
+
         for docName, terms in termsJson.items():
-            matchedTerms = [t for t in terms if t.lower() in extractedText]
+            if hits is None:
+                matchedTerms = [t for t, lt in zip(terms, lowerTerms[docName]) if lt in extractedText]
+            else:
+                matchedIdx = hits.get(docName, ())
+                matchedTerms = [t for i, t in enumerate(terms) if i in matchedIdx]
             probability = round(len(matchedTerms) / len(terms),2) if terms else 0.0
             if probability>bestProbablity:
                 bestDocument = docName
                 bestProbablity = probability
                 bestMatched = matchedTerms
-                
+                # No later document can score higher than a full match
+                if bestProbablity >= 1.0:
+                    break
+
         data = {
             "classficationStatus": bool(bestDocument),
             "fileName": baseFileName,
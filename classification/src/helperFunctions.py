@@ -1,12 +1,21 @@
 """Generic helper functions that are used across s2i Turbokit"""
 
 import re 
+import glob
 import json
 import os
+import ntpath
 import shutil
+import threading
+import uuid
+from functools import lru_cache
 from dotenv import load_dotenv
 
+# Regular expression pattern for extracting the domain of a URL
+_DOMAIN_RE = re.compile(r"(https?://)?(www\d?\.)?(?P<domain>[\w\.-]+\.\w+)(/\S*)?")
 
+
+@lru_cache(maxsize=1)
 def getS2iPath():
     """
     Get the root folder for s2i Turbokit. 
@@ -18,6 +27,7 @@ def getS2iPath():
     return s2iPath
 
 
+@lru_cache(maxsize=1)
 def getS2iRoot():
     """
     Get the root folder for s2i. 
@@ -59,11 +69,8 @@ def getDomainName(url):
     RETURN
         Return returnArray -> data: domain to return
     '''
-    # Define a regular expression pattern for extracting the domain
-    pattern = r"(https?://)?(www\d?\.)?(?P<domain>[\w\.-]+\.\w+)(/\S*)?"
-
-    # Use re.match to search for the pattern at the beginning of the URL
-    match = re.match(pattern, url)
+    # Match the precompiled pattern at the beginning of the URL
+    match = _DOMAIN_RE.match(url)
 
     # Check if a match is found
     if match:
@@ -134,17 +141,11 @@ def unpackDict2Str(dictionary):
     RETURN
         Return returnArray -> data: finalString
     '''
-    array2str = []
     try:
-        for key in dictionary:
-            value = dictionary[key]
-            stringKey = str(key)
-            stringVal = str(value)
-            fString = f'{stringKey}:{stringVal},'
-            array2str.append(fString)
-        finalString = "\n".join(array2str)
-        finalString = re.sub("^\\[", '', finalString)
-        finalString = re.sub("\\]$", '', finalString)
+        finalString = "\n".join(f'{key}:{value},' for key, value in dictionary.items())
+        # Every line ends with ',' so there is never a trailing ']'; only a key can start with '['
+        if finalString.startswith('['):
+            finalString = finalString[1:]
         returnArray = getReturnArray(True, '', finalString)
     except Exception as e:
         returnArray = getReturnArray(False, e, None)
@@ -159,13 +160,9 @@ def unpackFileName(filePath):
         Return returnArray -> data: fileName
     '''
     try:
-        if filePath.count("\\") > 0:
-            f = filePath.rsplit("\\")
-            fileName = f[-1]
-            returnArray = getReturnArray(True, '', fileName)
-        elif filePath.count("/") > 0:
-            f = filePath.rsplit("/")
-            fileName = f[-1]
+        if ("\\" in filePath) or ("/" in filePath):
+            # ntpath splits on both separators, whatever the platform
+            fileName = ntpath.basename(filePath)
             returnArray = getReturnArray(True, '', fileName)
         else:
             returnArray = getReturnArray(False, f'The file path {filePath} is not invalid!', None)
@@ -174,6 +171,13 @@ def unpackFileName(filePath):
 
     return returnArray
 
+def _removeTrees(paths):
+    '''
+        Deletes the given folders, ignoring errors. Runs in a background thread.
+    '''
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
 def checkDirectory(directory):
     '''
         Checks if the given path exists. If not, creates path.
@@ -183,9 +187,25 @@ def checkDirectory(directory):
         Returns returnArray -> data: returns path created.
     '''
     try:
-        if os.path.exists(directory):
+        # Old trees left behind by a run that was killed before its background delete finished
+        trashPrefix = os.path.normpath(directory) + '.trash-'
+        trashes = glob.glob(glob.escape(trashPrefix) + '*')
+        if os.path.isdir(directory):
+            # Move the old tree aside with a single rename and delete it in the background
+            trash = trashPrefix + uuid.uuid4().hex
+            try:
+                os.rename(directory, trash)
+            except OSError:
+                # E.g. a mount point, or no permission on the parent folder
+                shutil.rmtree(directory)
+            else:
+                trashes.append(trash)
+        elif os.path.exists(directory):
             shutil.rmtree(directory)
         os.makedirs(directory)
+        if trashes:
+            # Not a daemon thread, so the deletion is finished before the interpreter exits
+            threading.Thread(target=_removeTrees, args=(trashes,)).start()
 
         returnArray = getReturnArray(True, '', directory)
     except Exception as e:
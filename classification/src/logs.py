@@ -1,8 +1,71 @@
+import atexit
 import logging
+import logging.handlers
+import multiprocessing.util
+import os
+import queue
+
+# Log file name -> (queue handler, memory handler, listener) of the loggers set up in this process
+_listeners = {}
+
+def _startListener(logfile_name, formatter):
+    """
+    Starts the thread that writes queued records to the console and, batched, to the log file.
+    """
+    # Console handler
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    # File handler; INFO records are buffered and only written in batches, or as soon as an ERROR arrives
+    file_handler = logging.FileHandler(logfile_name, mode="a", encoding="utf-8")
+    file_handler.setFormatter(formatter)
+    memory_handler = logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, memory_handler)
+    listener.start()
+    return log_queue, memory_handler, listener
+
+def _stopListeners():
+    """
+    Stops the listener threads and flushes the buffered records to the log files.
+    """
+    while _listeners:
+        _, (_, memory_handler, listener) = _listeners.popitem()
+        listener.stop()
+        # MemoryHandler.close() flushes and then drops its target
+        file_handler = memory_handler.target
+        memory_handler.close()
+        file_handler.close()
+
+def _restartListenersInChild():
+    """
+    The listener threads do not survive a fork. Give the child its own queues and listeners,
+    and drop the records copied from the parent so they are not written twice.
+    """
+    inherited = list(_listeners.items())
+    _listeners.clear()
+    for logfile_name, (queue_handler, memory_handler, _) in inherited:
+        memory_handler.buffer = []
+        log_queue, new_memory_handler, listener = _startListener(logfile_name, memory_handler.target.formatter)
+        queue_handler.queue = log_queue
+        _listeners[logfile_name] = (queue_handler, new_memory_handler, listener)
+
+def _finalizeInWorker(stop_listeners):
+    """
+    multiprocessing workers leave through os._exit, which skips atexit but runs the multiprocessing finalizers.
+    """
+    multiprocessing.util.Finalize(None, stop_listeners, exitpriority=10)
+
+atexit.register(_stopListeners)
+os.register_at_fork(after_in_child=_restartListenersInChild)
+# Runs in forked and spawned workers, after multiprocessing has reset the finalizers inherited from the parent
+multiprocessing.util.register_after_fork(_stopListeners, _finalizeInWorker)
 
 def intializeLogs(logfile_name="./logs.log"):
     """
     Returns a logger instance that logs to both console and a file.
+    Records are handed to a queue and written by a background listener thread.
     """
     logger = logging.getLogger(logfile_name)
     logger.setLevel(logging.INFO)
@@ -10,14 +73,9 @@ def intializeLogs(logfile_name="./logs.log"):
 
     # Avoid duplicate handlers if get_logger is called multiple times
     if not logger.handlers:
-        # Console handler
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        logger.addHandler(stream_handler)
-
-        # File handler
-        file_handler = logging.FileHandler(logfile_name, mode="a", encoding="utf-8")
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        log_queue, memory_handler, listener = _startListener(logfile_name, formatter)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        logger.addHandler(queue_handler)
+        _listeners[logfile_name] = (queue_handler, memory_handler, listener)
 
-    return logger
\ No newline at end of file
+    return logger
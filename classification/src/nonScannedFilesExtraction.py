@@ -1,5 +1,6 @@
-import pdfplumber
+import fitz
 import os
+import orjson
 from src.logs import intializeLogs
 from src.helperFunctions import getReturnArray
 
@@ -14,14 +15,14 @@ def tableToMarkdown(table):
             return ""
         # Convert header to string
         header = [str(cell) if cell is not None else "" for cell in table[0]]
-        markdown = "| " + " | ".join(header) + " |\n"
-        markdown += "| " + " | ".join(['---'] * len(header)) + " |\n"
+        lines = ["| " + " | ".join(header) + " |", "| " + " | ".join(['---'] * len(header)) + " |"]
 
         # Convert rows
         for row in table[1:]:
             rowCells = [str(cell) if cell is not None else "" for cell in row]
-            markdown += "| " + " | ".join(rowCells) + " |\n"
-        return markdown
+            lines.append("| " + " | ".join(rowCells) + " |")
+        lines.append("")
+        return "\n".join(lines)
     except Exception as e:
         logger.error(f"Error in converting table to markdown format: {e}")
     return ""
@@ -37,30 +38,40 @@ def processPdfToJson(filePathInput, outputPath):
             return {},''
         outputFileName = outputPath + '/' + os.path.basename(filePathInput).split('.')[0] + "_extracted.json"
         results = {}
-        with pdfplumber.open(filePathInput) as pdf:
-            for page_num, page in enumerate(pdf.pages, start=1):
-                logger.info(f"Processing page {page_num}...")
-                page_text = page.extract_text() or ""
-                tables_markdown = ""
-                for table in page.extract_tables():
-                    tables_markdown += tableToMarkdown(table) + "\n"
-                
+        # Write the JSON one page at a time as it is extracted; orjson encodes each key and text.
+        # Pages go to a temporary file that replaces the output only once every page is extracted,
+        # so a failure part way never leaves a truncated JSON file behind
+        tempFileName = outputFileName + ".tmp"
+        try:
+            with fitz.open(filePathInput) as doc, open(tempFileName, "wb") as f:
+                f.write(b"{\n")
+                for page_num, page in enumerate(doc, start=1):
+                    logger.info(f"Processing page {page_num}...")
+                    page_text = page.get_text("text") or ""
+                    tables_markdown = ""
 
-                # Combine page text and markdown tables
-                full_text = page_text + "\n" + tables_markdown if tables_markdown else page_text
-                results[f"page_{page_num}"] = full_text.strip()
+                    # Extract the cells of the tables found by the same layout pass
+                    for table in page.find_tables().tables:
+                        tables_markdown += tableToMarkdown(table.extract()) + "\n"
 
+                    # Combine page text and markdown tables
+                    full_text = page_text + "\n" + tables_markdown if tables_markdown else page_text
+                    pageKey = f"page_{page_num}"
+                    text = full_text.strip()
+                    results[pageKey] = text
+
+                    if page_num > 1:
+                        f.write(b",\n")
+                    f.write(b"    " + orjson.dumps(pageKey) + b": " + orjson.dumps(text))
+                if results:
+                    f.write(b"\n")
+                f.write(b"}\n")
+
+            os.replace(tempFileName, outputFileName)
+        finally:
+            if os.path.exists(tempFileName):
+                os.remove(tempFileName)
 
-        # Write JSON manually to preserve real line breaks
-        with open(outputFileName, "w", encoding="utf-8") as f:
-            f.write("{\n")
-            for i, (page, text) in enumerate(results.items()):
-                f.write(f'    "{page}": """\n{text}\n"""')
-                if i < len(results) - 1:
-                    f.write(",\n")
-                else:
-                    f.write("\n")
-            f.write("}\n")
         logger.info(f"Text extraction completed. Output saved to {outputFileName}")
         return results,outputFileName
     except Exception as e:
@@ -1,17 +1,142 @@
 import boto3
 import json
-from pdf2image import convert_from_path
+import numpy as np
+import orjson
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from pdf2image import convert_from_path, pdfinfo_from_path
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from PIL import Image
 from src.logs import intializeLogs
 from src.helperFunctions import getReturnArray
 from dotenv import load_dotenv
+import hashlib
 import io
 import os
 import re
+import tempfile
+import threading
+import time
+import uuid
+from bisect import bisect_right
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 # Initialize logging
 logger = intializeLogs()
 
+load_dotenv()
+
+# Page text cleanup and section header detection, compiled once
+_MULTI_NL = re.compile(r'\n{3,}')
+_HEADER_HINTS = re.compile(r'^##|summary|results', re.IGNORECASE)
+
+# One client per AWS service and process, shared by all pages and threads (boto3 clients are thread safe)
+_awsClients = {}
+_awsClientsPid = None
+_awsClientsLock = threading.Lock()
+
+def _getAwsClient(service):
+    """
+    Returns the boto3 client of this process for the given service ('textract' or 's3'), creating it on first use.
+    A forked child builds its own clients rather than reuse the parent's connections.
+    """
+    global _awsClientsPid
+    client = _awsClients.get(service) if _awsClientsPid == os.getpid() else None
+    if client is None:
+        with _awsClientsLock:
+            if _awsClientsPid != os.getpid():
+                _awsClients.clear()
+                _awsClientsPid = os.getpid()
+            client = _awsClients.get(service)
+            if client is None:
+                config = Config(
+                    region_name=os.getenv('AWS_DEFAULT_REGION'),
+                    retries={
+                        'max_attempts': 10,
+                        'mode': 'adaptive'
+                    },
+                    connect_timeout=5,
+                    tcp_keepalive=True,
+                    max_pool_connections=max(16, int(os.getenv("TEXTRACT_CONCURRENCY", "4")))
+                )
+                client = boto3.client(service,
+                                      aws_access_key_id= os.getenv('AWS_ACCESS_KEY_ID'),
+                                      aws_secret_access_key= os.getenv('AWS_SECRET_ACCESS_KEY'),
+                                      config=config)
+                _awsClients[service] = client
+    return client
+
+# Error codes of a request rejected because the account is over its Textract throughput or job limits
+_THROTTLING_ERRORS = ('ProvisionedThroughputExceededException', 'ThrottlingException', 'LimitExceededException')
+
+def _isThrottled(error):
+    return isinstance(error, ClientError) and error.response.get('Error', {}).get('Code') in _THROTTLING_ERRORS
+
+def _logRetry(retryState):
+    logger.warning(f"Textract throttled the request, retrying in {retryState.next_action.sleep:.1f}s "
+                   f"(attempt {retryState.attempt_number})")
+
+@retry(retry=retry_if_exception(_isThrottled), wait=wait_exponential_jitter(initial=1, max=30),
+       stop=stop_after_attempt(int(os.getenv("TEXTRACT_THROTTLE_RETRIES", "5"))), before_sleep=_logRetry, reraise=True)
+def _callWithBackoff(operation, **kwargs):
+    """
+    Calls a Textract client operation. When botocore has used up its own retries on throttling, the call is
+    tried again after an exponential, jittered wait instead of failing the page or the job.
+    """
+    return operation(**kwargs)
+
+# Textract's OCR accuracy does not improve beyond this many pixels on the long edge of a page
+_MAX_IMAGE_EDGE = 3000
+_JPEG_QUALITY = 85
+
+def _encodeImage(image):
+    """
+    Returns the bytes to upload to Textract for a page image.
+        - A rendered page file within the size limit is sent as it is
+        - Otherwise the image is downscaled to _MAX_IMAGE_EDGE if needed and encoded as JPEG, which is several
+          times smaller than PNG for scanned pages
+    """
+    if isinstance(image, str):
+        with Image.open(image) as img:
+            if max(img.size) <= _MAX_IMAGE_EDGE:
+                with open(image, 'rb') as f:
+                    return f.read()
+            img.load()
+            image = img.copy()
+
+    if max(image.size) > _MAX_IMAGE_EDGE:
+        image = image.copy()
+        image.thumbnail((_MAX_IMAGE_EDGE, _MAX_IMAGE_EDGE), Image.LANCZOS)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    imgByteArr = io.BytesIO()
+    image.save(imgByteArr, format='JPEG', quality=_JPEG_QUALITY, optimize=False)
+    return imgByteArr.getvalue()
+
+# Block fields read when formatting a page; the rest of a Textract block (polygons, confidences, ...) is dropped
+_BLOCK_FIELDS = ('Id', 'BlockType', 'EntityTypes', 'Relationships', 'Text', 'RowIndex', 'ColumnIndex')
+
+def _projectBlock(block):
+    """
+    Returns a copy of a Textract block with only the fields used downstream, and only the bounding box of its geometry.
+    """
+    projected = {field: block[field] for field in _BLOCK_FIELDS if field in block}
+    geometry = block.get('Geometry')
+    if geometry and 'BoundingBox' in geometry:
+        projected['Geometry'] = {'BoundingBox': geometry['BoundingBox']}
+    return projected
+
 def extractTextFromImage(image):
 
     """
@@ -20,85 +145,181 @@ def extractTextFromImage(image):
         -   TABLES - extracts table information in the form of cells
         -   FORMS - extracts structured data
         -   Output - will be in the form of json, in the form of blocks (objects)
+        - image can be a PIL image or the path of a rendered page (JPEG or PNG)
     """
     try:
-        load_dotenv()
-        # Initialize Textract client with environment variables
+        # Get the Textract client initialized with environment variables
         try:
-            textract = boto3.client('textract', region_name= os.getenv('AWS_DEFAULT_REGION'), 
-                                    aws_access_key_id= os.getenv('AWS_ACCESS_KEY_ID'), 
-                                    aws_secret_access_key= os.getenv('AWS_SECRET_ACCESS_KEY'))
+            textract = _getAwsClient('textract')
         except Exception as e:
             logger.error(f"Failed to initialize Textract client: {e}")
             return []
-        
 
-
-        imgByteArr = io.BytesIO()
-        image.save(imgByteArr, format='PNG')
-        imgBytes = imgByteArr.getvalue()
+        imgBytes = _encodeImage(image)
 
         
-        response = textract.analyze_document(
+        response = _callWithBackoff(textract.analyze_document,
             Document={'Bytes': imgBytes},
             FeatureTypes=['TABLES', 'FORMS']
         )
 
-        return response['Blocks']
+        # Keep only what is needed, so the full response can be freed right away
+        return [_projectBlock(block) for block in response['Blocks']]
     except Exception as e:
         logger.error(f"Error extracting text from image: {e}")
     return []
 
+# Local OCR backends for short PDFs (OCR_BACKEND=tesseract|paddle), loaded on first use in each process
+_LOCAL_OCR_BACKENDS = ('tesseract', 'paddle')
+_paddleLock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _localOcrEngine(backend):
+    """
+    Returns the OCR engine module or model of a local backend, or None when its package is not installed.
+    """
+    try:
+        if backend == 'tesseract':
+            import pytesseract
+            return pytesseract
+        if backend == 'paddle':
+            from paddleocr import PaddleOCR
+            return PaddleOCR(lang='en', use_doc_orientation_classify=False, use_doc_unwarping=False,
+                             use_textline_orientation=True)
+    except ImportError:
+        logger.warning(f"OCR backend '{backend}' is not installed, using Textract")
+    except Exception as e:
+        logger.error(f"Failed to initialize OCR backend '{backend}', using Textract: {e}")
+    return None
+
+def _ocrBackendFor(pageCount):
+    """
+    Returns the OCR backend for a PDF of pageCount pages.
+        - The local backend set in OCR_BACKEND is used for PDFs of at most OCR_LOCAL_MAX_PAGES pages
+        - Longer PDFs, and all PDFs when no local backend is set or installed, go to Textract
+    """
+    backend = os.getenv("OCR_BACKEND", "textract").lower()
+    if backend not in _LOCAL_OCR_BACKENDS or pageCount > int(os.getenv("OCR_LOCAL_MAX_PAGES", "5")):
+        return 'textract'
+    return backend if _localOcrEngine(backend) is not None else 'textract'
+
+def extractTextLocally(image, backend):
+    """
+    Runs a local OCR backend on a page image.
+        - Returns LINE blocks shaped like Textract's, so processBlocks formats them the same way
+        - There is no table or form analysis; every line ends up in the raw text of the page
+        - image can be a PIL image or the path of a rendered page
+    """
+    try:
+        engine = _localOcrEngine(backend)
+        if backend == 'tesseract':
+            data = engine.image_to_data(image, output_type=engine.Output.DICT)
+            # Words come in reading order; group them by the block, paragraph and line Tesseract found
+            lines = {}
+            for n, word in enumerate(data['text']):
+                word = word.strip()
+                if word:
+                    lines.setdefault((data['block_num'][n], data['par_num'][n], data['line_num'][n]), []).append(word)
+            texts = [' '.join(words) for words in lines.values()]
+        else:
+            if not isinstance(image, str):
+                # PaddleOCR reads arrays as BGR
+                image = np.asarray(image.convert('RGB'))[:, :, ::-1]
+            # The model is not safe to call from several threads at once
+            with _paddleLock:
+                texts = [text for result in engine.predict(image) for text in result['rec_texts']]
+
+        return [{'Id': f"line-{n}", 'BlockType': 'LINE', 'Text': text} for n, text in enumerate(texts)]
+    except Exception as e:
+        logger.error(f"Error extracting text from image with {backend}: {e}")
+    return []
+
+def _tableTextMatcher(tableTexts):
+    """
+    Returns a function telling whether a lowercased line equals, is part of, or contains any of the table cell texts.
+        - A line inside a cell is found with one substring search over all cells joined by a separator
+        - Cells inside a line are found with an Aho-Corasick automaton when pyahocorasick is installed,
+          otherwise by scanning only the cells that are not longer than the line
+    """
+    if not tableTexts:
+        return lambda text: False
+
+    # Lines never contain the separator, so a match cannot span two cells
+    joinedCells = '\x00'.join(tableTexts)
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for cell in tableTexts:
+            automaton.add_word(cell, cell)
+        automaton.make_automaton()
+        containsCell = lambda text: next(automaton.iter(text), None) is not None
+    else:
+        # Only cells no longer than the line can occur in it; sorting by length lets each line stop there
+        cellsByLength = sorted(tableTexts, key=len)
+        cellLengths = [len(cell) for cell in cellsByLength]
+        containsCell = lambda text: any(cell in text for cell in islice(cellsByLength, bisect_right(cellLengths, len(text))))
+
+    return lambda text: text in tableTexts or text in joinedCells or containsCell(text)
+
 def processBlocks(blocks):
     try:
         if not blocks:
             return {"keyValuePairs": [], "sectionHeaders": [], "tables": [], "rawText": []}
 
-        blockMap = {block['Id']: block for block in blocks}
+        # Single pass: index the blocks by Id and bucket the ones we use by type, keeping their order
+        blockMap = {}
+        blocksByType = {'TABLE': [], 'KEY_VALUE_SET': [], 'LINE': []}
+        for block in blocks:
+            blockMap[block['Id']] = block
+            bucket = blocksByType.get(block['BlockType'])
+            if bucket is not None:
+                bucket.append(block)
         
+        # Page-wide pool of cell and line texts, so repeated headers and labels share one string object
+        strings = {}
+        # Joined child text of each block already visited on this page, by block Id
+        textCache = {}
+
         keyValuePairs = []
         tables = []
         sectionHeaders = []
         rawText = []
         tableTexts = set()  
 
-        # First pass: Build tables and extract table cell texts
-        for block in blocks:
-            if block['BlockType'] == 'TABLE':
-                table_result = buildTable(block, blockMap)
-                if table_result:
-                    tables.append(table_result)
-                    for row in table_result:
-                        for cell in row:
-                            cleaned = cell.strip().lower()
-                            if cleaned:
-                                tableTexts.add(cleaned)
-
-        # Second pass: Process everything else
-        for block in blocks:
-            if block['BlockType'] == 'KEY_VALUE_SET':
-                if 'KEY' in block.get('EntityTypes', []):
-                    key_text = getTextFromChildren(block, blockMap)
-                    value_text = ""
-                    for rel in block.get('Relationships', []):
-                        if rel['Type'] == 'VALUE':
-                            for value_id in rel['Ids']:
-                                if value_id in blockMap:
-                                    value_text += getTextFromChildren(blockMap[value_id], blockMap) + " "
-                    keyValuePairs.append((key_text.strip(), value_text.strip()))
-
-            elif block['BlockType'] == 'LINE':
-                text = block.get('Text', '').strip()
-                if not text:
-                    continue
-                text_lower = text.lower()
-                # Skip this line if it exactly matches any table cell or is part of one
-                if any(text_lower in table_text or table_text in text_lower for table_text in tableTexts):
-                    continue
-                if text.startswith('##') or "summary" in text_lower or "results" in text_lower:
-                    sectionHeaders.append(text)
-                else:
-                    rawText.append(text)
+        # Build tables and extract table cell texts
+        for block in blocksByType['TABLE']:
+            table_result = buildTable(block, blockMap, strings, textCache)
+            if table_result:
+                tables.append(table_result)
+                for row in table_result:
+                    for cell in row:
+                        cleaned = cell.strip().lower()
+                        if cleaned:
+                            tableTexts.add(strings.setdefault(cleaned, cleaned))
+        isTableText = _tableTextMatcher(tableTexts)
+
+        for block in blocksByType['KEY_VALUE_SET']:
+            if 'KEY' in block.get('EntityTypes', []):
+                key_text = getTextFromChildren(block, blockMap, strings, textCache)
+                value_text = ""
+                for rel in block.get('Relationships', []):
+                    if rel['Type'] == 'VALUE':
+                        for value_id in rel['Ids']:
+                            if value_id in blockMap:
+                                value_text += getTextFromChildren(blockMap[value_id], blockMap, strings, textCache) + " "
+                keyValuePairs.append((key_text.strip(), value_text.strip()))
+
+        for block in blocksByType['LINE']:
+            text = block.get('Text', '').strip()
+            if not text:
+                continue
+            text_lower = text.lower()
+            # Skip this line if it exactly matches any table cell or is part of one
+            if isTableText(text_lower):
+                continue
+            if _HEADER_HINTS.search(text):
+                sectionHeaders.append(text)
+            else:
+                rawText.append(text)
 
         return {
             "keyValuePairs": keyValuePairs,
@@ -117,16 +338,18 @@ def processBlocks(blocks):
         }
 
 
-def buildTable(tableBlock, blockMap):
+def buildTable(tableBlock, blockMap, strings=None, cache=None):
     """
     Processes a table block and extracts its content into a 2D list.
         - For the given textract table block, creates 2D rows and columns into 2D List
         - Iterates over child blocks via Relationships and find the cell. 
         - creates the empty grid for the table
-        - append each cell's word into the row[i] col[i] iteratively
+        - scatters every cell's words into its row[i] col[i] in one assignment
     """
     try:
-        cells = []
+        rows = []
+        cols = []
+        texts = []
         for rel in tableBlock.get('Relationships', []):
             if rel['Type'] == 'CHILD':
                 for cell_id in rel['Ids']:
@@ -136,43 +359,58 @@ def buildTable(tableBlock, blockMap):
                     if cellBlock['BlockType'] != 'CELL':
                         continue
                     
-                    cellText = getTextFromChildren(cellBlock, blockMap)
-                    cells.append({
-                        'row': cellBlock['RowIndex'],
-                        'col': cellBlock['ColumnIndex'],
-                        'text': cellText
-                    })
+                    rows.append(cellBlock['RowIndex'])
+                    cols.append(cellBlock['ColumnIndex'])
+                    texts.append(getTextFromChildren(cellBlock, blockMap, strings, cache))
         
-        if not cells:
+        if not texts:
             return None
         
-        maxRow = max(cell['row'] for cell in cells)
-        maxCol = max(cell['col'] for cell in cells)
-        table = [['' for _ in range(maxCol)] for _ in range(maxRow)]
-        for cell in cells:
-            if cell['row']-1 < len(table) and cell['col']-1 < len(table[0]):
-                table[cell['row']-1][cell['col']-1] = cell['text']
+        # Preallocate the grid and scatter all cell texts into it at once
+        rowIdx = np.fromiter(rows, dtype=np.int32, count=len(rows))
+        colIdx = np.fromiter(cols, dtype=np.int32, count=len(cols))
+        grid = np.empty((rowIdx.max(), colIdx.max()), dtype=object)
+        grid.fill('')
+        cellTexts = np.empty(len(texts), dtype=object)
+        cellTexts[:] = texts
+        grid[rowIdx - 1, colIdx - 1] = cellTexts
+        table = grid.tolist()
         return table
     except Exception as e:
         logger.error(f"Error building table: {e}")
     return None
 
-def getTextFromChildren(block, blockMap):
+def getTextFromChildren(block, blockMap, strings=None, cache=None):
+    """
+    Joins the text of the WORD and LINE children of a block.
+    When a strings dict is given, equal texts are returned as one shared string object.
+    When a cache dict is given, the text of a block is computed once and looked up by its Id afterwards.
+    """
     try:
-        text = ''
+        if cache is not None and block['Id'] in cache:
+            return cache[block['Id']]
+        words = []
         for rel in block.get('Relationships', []):
             if rel['Type'] == 'CHILD':
                 for child_id in rel['Ids']:
                     if child_id not in blockMap:
                         continue
                     child = blockMap[child_id]
-                    if child['BlockType'] in ['WORD', 'LINE']:
-                        text += child['Text'] + ' '
-        return text.strip()
+                    if child['BlockType'] in ('WORD', 'LINE'):
+                        words.append(child['Text'])
+        text = ' '.join(words).strip()
+        if strings is not None:
+            text = strings.setdefault(text, text)
+        if cache is not None:
+            cache[block['Id']] = text
+        return text
     except Exception as e:
         logger.error(f"Error getting text from children: {e}")
     return ''
 
+# Element-wise 'cell has non-whitespace text' over an object array of strings
+_isNonBlank = np.frompyfunc(lambda cell: bool(cell) and not cell.isspace(), 1, 1)
+
 def cleanTable(table):
     """ Cleans the table by removing empty rows and columns.
         - Removes rows that are completely empty
@@ -183,19 +421,24 @@ def cleanTable(table):
         if not table:
             return []
         
-        # Remove empty rows and columns
-        table = [row for row in table if any(cell.strip() for cell in row)]
-        if not table:
+        # Mark the non-blank cells once, then drop empty rows and columns with two reductions
+        grid = np.array(table, dtype=object)
+        nonBlank = _isNonBlank(grid).astype(bool)
+        keepRows = nonBlank.any(axis=1)
+        if not keepRows.any():
             return []
-        
-        # Remove empty columns
-        transposed = list(zip(*table))
-        transposed = [col for col in transposed if any(cell.strip() for cell in col)]
-        return list(zip(*transposed))
+        return grid[keepRows][:, nonBlank.any(axis=0)].tolist()
     except Exception as e:
         logger.error(f"Error cleaning table: {e}")
     return []
 
+@lru_cache(maxsize=64)
+def _separatorRow(columns):
+    """
+    Returns the Markdown header separator row for a table with the given number of columns.
+    """
+    return "| " + " | ".join(["---"] * columns) + " |"
+
 def tableToMarkdown(table):
     """
     Converts a 2D table into a Markdown formatted string.
@@ -211,11 +454,9 @@ def tableToMarkdown(table):
         if not len(cleaned):
             return ""
         
-        markdown = "| " + " | ".join(cleaned[0]) + " |\n"
-        markdown += "| " + " | ".join(["---"] * len(cleaned[0])) + " |\n"
-        for row in cleaned[1:]:
-            markdown += "| " + " | ".join(row) + " |\n"
-        return markdown.rstrip()
+        lines = ["| " + " | ".join(cleaned[0]) + " |", _separatorRow(len(cleaned[0]))]
+        lines.extend("| " + " | ".join(row) + " |" for row in cleaned[1:])
+        return "\n".join(lines)
     except Exception as e:
         logger.error(f"Error converting table to markdown: {e}")
     return ""
@@ -227,31 +468,33 @@ def formatPageContent(result):
     """
     try:
         contentLines = []
+        rawText = deque(result["rawText"])
+        tables = deque(result["tables"])
         
         # Add section headers, body and tables
         for header in result["sectionHeaders"]:
             contentLines.append(f"## {header}")
             contentLines.append("")  # Empty line
 
-            if result['rawText']:
+            if rawText:
                 contentLines.append("")
-                contentLines.append(result['rawText'].pop(0).strip())
+                contentLines.append(rawText.popleft().strip())
                 contentLines.append("")
             
-            if result["tables"]:
-                tableMd = tableToMarkdown(result["tables"].pop(0))
+            if tables:
+                tableMd = tableToMarkdown(tables.popleft())
                 if tableMd:
                     contentLines.append(tableMd)
                     contentLines.append("")
                 
         # Add remaining raw text
-        for text in result["rawText"]:
+        for text in rawText:
             if text.strip():
                 contentLines.append(text.strip())
                 contentLines.append("")
 
         # Add any remaining tables
-        for table in result["tables"]:
+        for table in tables:
             tableMd = tableToMarkdown(table)
             if tableMd:
                 contentLines.append(tableMd)
@@ -271,37 +514,369 @@ def formatPageContent(result):
     return ""
 
 
+class _RateLimiter:
+    """
+    Spaces out calls so that at most 'rate' of them start per second, across threads. A rate of 0 disables the limit.
+    """
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.nextSlot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.nextSlot)
+            self.nextSlot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _formatBlocks(blocks):
+    """
+    Formats the Textract blocks of one page as the page text.
+    """
+    result = processBlocks(blocks)
+    pageContent = formatPageContent(result)
+
+    return _MULTI_NL.sub('\n\n', pageContent)
+
+
+def _writeAtomic(path, text):
+    """
+    Writes text to path through a temporary file, so readers never see a partly written file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tempPath = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tempPath, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tempPath, path)
+
+
+def _fileDigest(filePath, cacheRoot):
+    """
+    Returns the blake2b digest of the content of a file.
+    The digest is remembered in the cache with the size and modification time of the file, so an unchanged
+    file is not read again on the next run.
+    """
+    stat = os.stat(filePath)
+    stamp = f"{stat.st_size} {stat.st_mtime_ns}"
+    pathKey = hashlib.blake2b(os.path.abspath(filePath).encode("utf-8"), digest_size=16).hexdigest()
+    stampFile = os.path.join(cacheRoot, "files", pathKey)
+    try:
+        with open(stampFile, encoding="utf-8") as f:
+            savedStamp, digest = f.read().rsplit(" ", 1)
+        if savedStamp == stamp:
+            return digest
+    except (OSError, ValueError):
+        pass
+
+    fileHash = hashlib.blake2b(digest_size=16)
+    with open(filePath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            fileHash.update(chunk)
+    digest = fileHash.hexdigest()
+    _writeAtomic(stampFile, f"{stamp} {digest}")
+    return digest
+
+
+def _pageCacheDir(filePathInput, ocrBackend):
+    """
+    Returns the folder holding the cached page texts of a PDF for an OCR backend, or None when OCR_CACHE_DIR
+    is not set. The folder is named after the content of the PDF, so a changed file is OCRed again.
+    """
+    cacheRoot = os.getenv("OCR_CACHE_DIR")
+    if not cacheRoot:
+        return None
+    try:
+        return os.path.join(cacheRoot, f"{_fileDigest(filePathInput, cacheRoot)}-{ocrBackend}")
+    except Exception as e:
+        logger.warning(f"OCR cache disabled for {os.path.basename(filePathInput)}: {e}")
+    return None
+
+
+def _readCachedPages(cacheDir, pageCount):
+    """
+    Returns the cached text of the pages of a PDF keyed by page number; pages not in the cache are left out.
+    """
+    pageContents = {}
+    if cacheDir is None:
+        return pageContents
+    for i in range(1, pageCount + 1):
+        try:
+            with open(os.path.join(cacheDir, f"page_{i}.json"), encoding="utf-8") as f:
+                pageContents[i] = json.load(f)
+        except (OSError, ValueError):
+            pass
+    return pageContents
+
+
+def _cachePage(cacheDir, i, text):
+    """
+    Stores the text of a page in the cache. Empty pages are not stored, as a failed OCR call also ends up
+    empty and should be retried on the next run.
+    """
+    if cacheDir is None or not text:
+        return
+    try:
+        _writeAtomic(os.path.join(cacheDir, f"page_{i}.json"), json.dumps(text, ensure_ascii=False))
+    except Exception as e:
+        logger.warning(f"Could not cache the text of page {i}: {e}")
+
+
+# Pages shorter than this many pixels are stacked into one image, up to TEXTRACT_TILE_PAGES per Textract call.
+# Off unless TEXTRACT_TILE_PAGES is set above 1
+_TILE_MAX_PAGE_HEIGHT = 1500
+# White strip between the stacked pages, so Textract does not join lines or tables across them
+_TILE_GAP = 40
+
+def _tilePages(pages, maxPages):
+    """
+    Groups rendered (page number, image path) pairs into the units sent to Textract.
+        - Consecutive small pages are grouped as long as the stacked image stays within _MAX_IMAGE_EDGE,
+          so it is not downscaled
+        - Other pages are sent on their own
+    """
+    groups = []
+    tileHeight = 0
+    for i, page in pages:
+        with Image.open(page) as img:
+            width, height = img.size
+        small = maxPages > 1 and height < _TILE_MAX_PAGE_HEIGHT and width <= _MAX_IMAGE_EDGE
+        if (small and groups and tileHeight and len(groups[-1]) < maxPages
+                and tileHeight + _TILE_GAP + height <= _MAX_IMAGE_EDGE):
+            groups[-1].append((i, page))
+            tileHeight += _TILE_GAP + height
+        else:
+            groups.append([(i, page)])
+            tileHeight = height if small else 0
+    return groups
+
+def _analyzeTile(pages):
+    """
+    Stacks small page images into one image, analyzes it with a single Textract call and splits the blocks by page.
+        - LINE, TABLE and KEY blocks go to the page their centre falls on
+        - Words, cells and values are given to every page, so the relationships of those blocks still resolve
+    Returns the blocks of each page keyed by page number, or None when the Textract call returned nothing.
+    """
+    images = [Image.open(page) for _, page in pages]
+    try:
+        width = max(img.width for img in images)
+        height = sum(img.height for img in images) + _TILE_GAP * (len(images) - 1)
+        tile = Image.new('RGB', (width, height), 'white')
+        # Bottom edge of each page in the tile, extended to the middle of the following gap
+        pageBottoms = []
+        top = 0
+        for (i, _), img in zip(pages, images):
+            tile.paste(img, (0, top))
+            top += img.height + _TILE_GAP
+            pageBottoms.append((i, top - _TILE_GAP / 2))
+    finally:
+        for img in images:
+            img.close()
+
+    pageBlocks = {i: [] for i, _ in pages}
+    sharedBlocks = []
+    blocks = extractTextFromImage(tile)
+    if not blocks:
+        return None
+    for block in blocks:
+        if block['BlockType'] in ('LINE', 'TABLE') or (
+                block['BlockType'] == 'KEY_VALUE_SET' and 'KEY' in block.get('EntityTypes', [])):
+            box = block['Geometry']['BoundingBox']
+            centre = (box['Top'] + box['Height'] / 2) * height
+            page = next((i for i, bottom in pageBottoms if centre < bottom), pageBottoms[-1][0])
+            pageBlocks[page].append(block)
+        else:
+            sharedBlocks.append(block)
+    for blocks in pageBlocks.values():
+        blocks.extend(sharedBlocks)
+    return pageBlocks
+
+
+def _processPages(pages, rateLimiter, ocrBackend='textract', cacheDir=None):
+    """
+    Runs Textract, or the given local OCR backend, on one page image, or Textract on a tile of several small
+    page images, and formats the result as the page texts. Returns the texts keyed by page number.
+    The texts are cached as soon as they are ready, so an interrupted run resumes from the pages already done.
+    """
+    logger.info(f"Processing page {', '.join(str(i) for i, _ in pages)}...")
+    if ocrBackend != 'textract':
+        pageBlocks = {i: extractTextLocally(page, ocrBackend) for i, page in pages}
+    else:
+        rateLimiter.wait()
+        if len(pages) == 1:
+            pageBlocks = {i: extractTextFromImage(page) for i, page in pages}
+        else:
+            pageBlocks = _analyzeTile(pages)
+            if pageBlocks is None:
+                # A failed tile call must not blank all its pages; send them again one by one
+                logger.warning(f"No result for the tile of pages {', '.join(str(i) for i, _ in pages)}, sending them one by one")
+                pageBlocks = {}
+                for i, page in pages:
+                    rateLimiter.wait()
+                    pageBlocks[i] = extractTextFromImage(page)
+
+    pageContents = {}
+    for i, blocks in pageBlocks.items():
+        pageContents[i] = _formatBlocks(blocks)
+        _cachePage(cacheDir, i, pageContents[i])
+    return pageContents
+
+
+def _pageRuns(pageNumbers, maxLength):
+    """
+    Splits sorted page numbers into (first, last) ranges of consecutive pages, at most maxLength pages long.
+    """
+    run = []
+    for i in pageNumbers:
+        if run and (i != run[-1] + 1 or len(run) == maxLength):
+            yield run[0], run[-1]
+            run = []
+        run.append(i)
+    if run:
+        yield run[0], run[-1]
+
+
+def _analyzePages(filePathInput, pageNumbers, ocrBackend='textract', cacheDir=None):
+    """
+    Rasterizes the given pages of the PDF and runs a synchronous Textract AnalyzeDocument call, or local OCR,
+    per page image; small consecutive pages share one Textract call. Returns the text of each page keyed by page number.
+    """
+    # Textract calls are I/O bound; send a bounded number of pages at a time, optionally capped in requests per second
+    concurrency = max(1, int(os.getenv("TEXTRACT_CONCURRENCY", "4")))
+    rateLimiter = _RateLimiter(float(os.getenv("TEXTRACT_RPS", "0")))
+    tilePages = max(1, int(os.getenv("TEXTRACT_TILE_PAGES", "1"))) if ocrBackend == 'textract' else 1
+    pageContents = {}
+
+    # Render the pages into a temporary folder a few at a time and hand each page to Textract as soon as it is
+    # rendered, so rendering the next pages overlaps with OCR of the previous ones
+    with tempfile.TemporaryDirectory() as tmpDir, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = []
+        for firstPage, lastPage in _pageRuns(pageNumbers, concurrency):
+            # Do not render too far ahead of OCR
+            pending = [f for f in futures if not f.done()]
+            while len(pending) >= 2 * concurrency:
+                wait(pending, return_when=FIRST_COMPLETED)
+                pending = [f for f in pending if not f.done()]
+
+            pagePaths = convert_from_path(filePathInput, first_page=firstPage, last_page=lastPage,
+                                          thread_count=max(1, min(concurrency, (os.cpu_count() or 1) - 1)),
+                                          output_folder=tmpDir, fmt="jpeg", jpegopt={"quality": _JPEG_QUALITY},
+                                          paths_only=True)
+            pages = list(enumerate(pagePaths, start=firstPage))
+            for group in _tilePages(pages, tilePages) if tilePages > 1 else [[page] for page in pages]:
+                futures.append(executor.submit(_processPages, group, rateLimiter, ocrBackend, cacheDir))
+
+        for future in futures:
+            pageContents.update(future.result())
+
+    return pageContents
+
+
+def _analyzeDocumentAsync(filePathInput, bucket):
+    """
+    Uploads the PDF to S3 and analyzes the whole document with a single asynchronous Textract job.
+    Returns the text of each page keyed by page number, or None if the job could not be completed.
+    """
+    key = f"textract-staging/{uuid.uuid4().hex}/{os.path.basename(filePathInput)}"
+    uploaded = False
+    try:
+        s3 = _getAwsClient('s3')
+        textract = _getAwsClient('textract')
+        s3.upload_file(filePathInput, bucket, key)
+        uploaded = True
+        jobId = _callWithBackoff(textract.start_document_analysis,
+            DocumentLocation={'S3Object': {'Bucket': bucket, 'Name': key}},
+            FeatureTypes=['TABLES', 'FORMS']
+        )['JobId']
+        logger.info(f"Started Textract job {jobId} for {os.path.basename(filePathInput)}")
+
+        # Poll until the job is finished
+        deadline = time.monotonic() + float(os.getenv("TEXTRACT_ASYNC_TIMEOUT", "900"))
+        while True:
+            response = _callWithBackoff(textract.get_document_analysis, JobId=jobId, MaxResults=1000)
+            status = response['JobStatus']
+            if status != 'IN_PROGRESS':
+                break
+            if time.monotonic() > deadline:
+                # Textract cannot cancel a job: it keeps running, and is billed, while the pages are analyzed again
+                logger.error(f"Textract job {jobId} did not finish within TEXTRACT_ASYNC_TIMEOUT; the job is still "
+                             f"running and will be billed, and the pages are now analyzed again one by one")
+                return None
+            time.sleep(2)
+
+        if status not in ('SUCCEEDED', 'PARTIAL_SUCCESS'):
+            logger.error(f"Textract job {jobId} ended with status {status}: {response.get('StatusMessage', '')}")
+            return None
+
+        # Collect the blocks of all result pages, grouped by PDF page
+        pageBlocks = {}
+        while True:
+            for block in response.get('Blocks', []):
+                pageBlocks.setdefault(block.get('Page', 1), []).append(_projectBlock(block))
+            nextToken = response.get('NextToken')
+            if not nextToken:
+                break
+            response = _callWithBackoff(textract.get_document_analysis, JobId=jobId, MaxResults=1000, NextToken=nextToken)
+
+        return {i: _formatBlocks(blocks) for i, blocks in pageBlocks.items()}
+    except Exception as e:
+        logger.error(f"Error in asynchronous Textract analysis, falling back to page images: {e}")
+        return None
+    finally:
+        if uploaded:
+            try:
+                s3.delete_object(Bucket=bucket, Key=key)
+            except Exception as e:
+                logger.warning(f"Could not delete staged file s3://{bucket}/{key}: {e}")
+
+
 def processPdfToJson(filePathInput, outputPath):
     
     """
         Main function to process the PDF and extract text.
+        Large PDFs are analyzed as a whole by an asynchronous Textract job when TEXTRACT_S3_BUCKET is set,
+        other PDFs page by page from rendered images, with local OCR for short PDFs when OCR_BACKEND is set.
+        When OCR_CACHE_DIR is set, the text of each page is cached there and reused when the same PDF is processed again.
     """
     try:
         if not os.path.exists(filePathInput):
             logger.error(f"PDF file not found: {filePathInput}")
             return {},''
-        pages = convert_from_path(filePathInput)
         outputFileName = outputPath + '/' + os.path.basename(filePathInput).split('.')[0] + "_extracted.json"
-        results = {}
-        for i, page in enumerate(pages, start=1):
-            logger.info(f"Processing page {i}...")
-            blocks = extractTextFromImage(page)
-            result = processBlocks(blocks)
-            pageContent = formatPageContent(result)
-            
-            pageContent = re.sub(r'\n{3,}', '\n\n', pageContent)
-            results[f"page_{i}"] = pageContent
-        
-        # Write JSON manually to preserve real line breaks
-        with open(outputFileName, "w", encoding="utf-8") as f:
-            f.write("{\n")
-            for i, (page, text) in enumerate(results.items()):
-                f.write(f'    "{page}": """\n{text}\n"""')
-                if i < len(results) - 1:
-                    f.write(",\n")
-                else:
-                    f.write("\n")
-            f.write("}\n")
+        pageCount = pdfinfo_from_path(filePathInput)["Pages"]
+
+        ocrBackend = _ocrBackendFor(pageCount)
+        cacheDir = _pageCacheDir(filePathInput, ocrBackend)
+        pageContents = _readCachedPages(cacheDir, pageCount)
+        if pageContents:
+            logger.info(f"Reusing the cached text of {len(pageContents)} of {pageCount} pages")
+        missingPages = [i for i in range(1, pageCount + 1) if i not in pageContents]
+
+        if missingPages:
+            analyzed = None
+            stagingBucket = os.getenv("TEXTRACT_S3_BUCKET")
+            # The async job always analyzes the whole PDF, so it is only worth it when no page is cached yet
+            if (ocrBackend == 'textract' and stagingBucket and not pageContents
+                    and pageCount > int(os.getenv("TEXTRACT_ASYNC_MIN_PAGES", "5"))):
+                analyzed = _analyzeDocumentAsync(filePathInput, stagingBucket)
+                if analyzed is not None:
+                    for i, text in analyzed.items():
+                        _cachePage(cacheDir, i, text)
+            if analyzed is None:
+                analyzed = _analyzePages(filePathInput, missingPages, ocrBackend, cacheDir)
+            pageContents.update(analyzed)
+
+        results = {f"page_{i}": pageContents.get(i, "") for i in range(1, pageCount + 1)}
+
+        # Write valid JSON with a single write; orjson encodes each key and page text straight to UTF-8 bytes.
+        # The layout is the same as json.dump(results, f, ensure_ascii=False, indent=4)
+        entries = b",\n    ".join(orjson.dumps(page) + b": " + orjson.dumps(text) for page, text in results.items())
+        with open(outputFileName, "wb") as f:
+            f.write(b"{\n    " + entries + b"\n}\n" if results else b"{}\n")
 
         logger.info(f"Text extraction completed. Output saved to {outputFileName}")
         return results,outputFileName
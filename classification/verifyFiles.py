@@ -5,6 +5,7 @@ from src.helperFunctions import getReturnArray, checkPath, checkDirectory, write
 from src.logs import intializeLogs
 import os
 import json
+from concurrent.futures import ProcessPoolExecutor
 
 # Initialize logger
 logger = intializeLogs()
@@ -86,8 +87,6 @@ def generateVerification(batchFolder, identificationList, outputFilePath):
         Return returnArray -> data: list of file details with extracted text.
     """
     try:
-        logger.info(f"Loading environment variables for text extraction...")
-        load_dotenv()
         if not os.path.exists(batchFolder):
             logger.error(f"Batch folder does not exist: {batchFolder}")
             return getReturnArray(False, "Batch folder does not exist", None)
@@ -103,17 +102,29 @@ def generateVerification(batchFolder, identificationList, outputFilePath):
         finalSearchedFiles = []
         dataMontage = {}
         logger.info(f"Found {len(files['scannedFiles'])} scanned files and {len(files['normalFiles'])} normal files.")
-        for file in files['scannedFiles']:
-            logger.info(f"Processing scanned file: {file}")
-            scannedSearchResults = scanDocument(file, 'scanned', identificationList,outputFilePath)
-            if scannedSearchResults['status']:
-                finalSearchedFiles.append(scannedSearchResults['data'][0])
+        # Files are scanned in worker processes. Scanned files get a pool of their own, kept small because each
+        # one already runs TEXTRACT_CONCURRENCY OCR requests at a time against the shared Textract quota
+        docWorkers = max(1, int(os.getenv('DOC_WORKERS', os.cpu_count() or 1)))
+        textractDocWorkers = max(1, min(docWorkers, int(os.getenv('TEXTRACT_DOC_WORKERS', '2'))))
+        with ProcessPoolExecutor(max_workers=textractDocWorkers) as scannedExecutor, \
+                ProcessPoolExecutor(max_workers=docWorkers) as normalExecutor:
+            futures = []
+            for fileType, executor, fileList in (('scanned', scannedExecutor, files['scannedFiles']),
+                                                 ('normal', normalExecutor, files['normalFiles'])):
+                for file in fileList:
+                    logger.info(f"Processing {fileType} file: {file}")
+                    futures.append((file, executor.submit(scanDocument, file, fileType, identificationList, outputFilePath)))
 
-        for file in files['normalFiles']:
-            logger.info(f"Processing normal file: {file}")
-            nonScannedSearchResults = scanDocument(file, 'normal', identificationList,outputFilePath)
-            if nonScannedSearchResults['status']:
-                finalSearchedFiles.append(nonScannedSearchResults['data'][0])
+            # Collect in submission order so the output lists the scanned files first, as before.
+            # A worker that dies (e.g. killed for memory) only loses its own file, not the finished ones
+            for file, future in futures:
+                try:
+                    searchResults = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to process file {file}: {e}")
+                    continue
+                if searchResults['status']:
+                    finalSearchedFiles.append(searchResults['data'][0])
         dataMontage['batchDocs'] = finalSearchedFiles
 
         logger.info(finalSearchedFiles)